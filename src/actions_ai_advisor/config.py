@@ -1,6 +1,7 @@
 """Configuration module for Actions Advisor."""
 
 import os
+from functools import cached_property
 from typing import Literal
 
 from pydantic import Field, ValidationInfo, field_validator
@@ -23,6 +24,9 @@ class Config(BaseSettings):
     )
     model: str = Field(default="gpt-4o-mini", description="Model name")
     base_url: str | None = Field(default=None, description="Custom API URL for selfhosted")
+    max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of jobs analyzed by the LLM at once"
+    )
 
     # GitHub Actions environment variables (no INPUT_ prefix)
     github_repository: str = Field(
@@ -46,16 +50,14 @@ class Config(BaseSettings):
             raise ValueError("base_url is required when provider is 'selfhosted'")
         return v
 
-    @property
+    @cached_property
     def repo_owner(self) -> str:
         """Extract repository owner from GITHUB_REPOSITORY."""
-        if "/" in self.github_repository:
-            return self.github_repository.split("/")[0]
-        return ""
+        owner, sep, _ = self.github_repository.partition("/")
+        return owner if sep else ""
 
-    @property
+    @cached_property
     def repo_name(self) -> str:
         """Extract repository name from GITHUB_REPOSITORY."""
-        if "/" in self.github_repository:
-            return self.github_repository.split("/")[1]
-        return ""
+        _, _, rest = self.github_repository.partition("/")
+        return rest.partition("/")[0]
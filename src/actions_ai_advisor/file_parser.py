@@ -1,59 +1,215 @@
 """Parse file paths and line numbers from error logs."""
 
+import mmap
+import os
 import re
-from dataclasses import dataclass
-
-
-@dataclass
+import sys
+from bisect import insort
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from itertools import repeat
+from typing import NamedTuple
+
+try:
+    # Optional DFA-based engine (pip install "actions-ai-advisor[re2]"). It finds the
+    # lines that mention a file in one linear-time pass over the whole log; the file
+    # patterns themselves always run with the stdlib engine on those lines, so results
+    # don't depend on whether it is installed.
+    import re2 as _linear_re
+except ImportError:
+    _linear_re = re
+
+
+@dataclass(slots=True, frozen=True)
 class AffectedFile:
-    """Represents a file mentioned in error logs."""
+    """Represents a file mentioned in error logs.
+
+    Frozen and slotted: instances are cheap to create and hash by
+    (file_path, line_start, line_end), which is what deduplication uses.
+    """
 
     file_path: str
     line_start: int | None = None
     line_end: int | None = None
-    description: str | None = None
-
-    def __hash__(self) -> int:
-        """Make hashable for deduplication."""
-        return hash((self.file_path, self.line_start, self.line_end))
-
-    def __eq__(self, other: object) -> bool:
-        """Compare for deduplication."""
-        if not isinstance(other, AffectedFile):
-            return False
-        return (
-            self.file_path == other.file_path
-            and self.line_start == other.line_start
-            and self.line_end == other.line_end
-        )
+    description: str | None = field(default=None, compare=False)
 
 
 # Common error patterns across languages (covers ~90% of cases)
 # Pattern component for cross-platform paths (Windows: C:\path\file, Unix: /path/file)
 PATH_PATTERN = r"(?:[A-Za-z]:[\\/])?[\w.\/\\\-]+"
 
-FILE_PATTERNS = [
-    # Python traceback: File "/path/to/file.py", line 123 (handles both / and \)
-    re.compile(r'File "(?P<file>[^"]+\.(?:py|pyx))", line (?P<line>\d+)'),
-    # PHP errors: in /path/to/file.php on line 4
-    re.compile(rf" in (?P<file>{PATH_PATTERN}\.php) on line (?P<line>\d+)"),
-    # .NET/C# errors: Program.cs(10,31): error CS0103 or C:\path\Program.cs(10,31)
-    re.compile(rf"(?P<file>{PATH_PATTERN}\.cs)\((?P<line>\d+),\d+\):"),
-    # Linters/type checkers with quoted files: mypy: "src/types.py" or "src\types.py"
-    re.compile(r'(?:mypy|ruff|pylint|flake8|pyright|black):\s+"(?P<file>[^"]+)"'),
-    # Dockerfile errors: Dockerfile:4
-    re.compile(r"(?P<file>Dockerfile(?:\.[a-z]+)?):(?P<line>\d+)"),
-    # Generic: file.py:123 or file.py:123:45 (Windows: C:\path\file.py:123)
-    re.compile(rf"(?P<file>{PATH_PATTERN}\.(?:py|js|ts|tsx|jsx|go|rs|rb|java|cpp|c|h|cs|php|swift|kt|scala)):(?P<line>\d+)(?::\d+)?"),
-    # Node.js stack: at /path/to/file.js:123:45 or at C:\path\file.js:123:45
-    re.compile(rf"at (?P<file>{PATH_PATTERN}\.(?:js|ts|tsx|jsx)):(?P<line>\d+):\d+"),
-    # Common extensionless files: Makefile, CMakeLists.txt
-    re.compile(r"(?P<file>(?:Makefile|CMakeLists\.txt|Gemfile|Rakefile)):(?P<line>\d+)"),
-    # Webpack: Module not found: Error: Can't resolve './src' or '.\src'
-    re.compile(rf"Can't resolve ['\"](?P<file>{PATH_PATTERN})['\"]"),
-    # Generic file mention: checking src/main.py or src\main.py
-    re.compile(rf"(?:checking|in|file|from|import)\s+(?P<file>{PATH_PATTERN}\.(?:py|js|ts|go|rs|rb|java))"),
-]
+# Source extensions recognized by the extension-anchored patterns below
+_NODE_EXTENSIONS = ("js", "ts", "tsx", "jsx")
+_MENTION_EXTENSIONS = ("py", "js", "ts", "go", "rs", "rb", "java")
+_LOCATION_EXTENSIONS = (
+    "py", "js", "ts", "tsx", "jsx", "go", "rs", "rb", "java",
+    "cpp", "c", "h", "cs", "php", "swift", "kt", "scala",
+)
+
+
+# Every file pattern match contains at least one of these characters
+_MATCH_CHARACTERS = (".", ":", "'")
+
+
+class FilePattern(NamedTuple):
+    """A file/line pattern and the metadata needed to run it cheaply."""
+
+    pattern: re.Pattern[str]
+    # Every match contains at least one of these; without RE2, the pattern
+    # only runs on logs and lines where one of them occurs
+    literals: tuple[str, ...]
+    # Whether the pattern captures a "line" group
+    has_line_group: bool
+
+
+# Substring search is far cheaper than a regex scan, so patterns whose literals
+# are absent from the log are skipped entirely. The sharper the literals, the
+# fewer lines the stdlib fallback has to run a pattern on.
+#
+# Each pattern runs on its own, so matches of different patterns may overlap
+# ("in src/App.tsx:12" is both a mention and a location). With RE2, the active
+# patterns are also joined into one alternation that only picks out the lines to
+# run them on.
+#
+# No pattern may match across a line break (use [^\S\r\n] rather than \s, and
+# exclude \r\n from negated classes): that alternation scans the whole log at once.
+@cache
+def _file_patterns() -> tuple[FilePattern, ...]:
+    """Return the file/line patterns, compiling them on first use.
+
+    Importing the module (the formatter only needs format_github_link) then
+    doesn't pay for compiling patterns that may never run.
+    """
+    return (
+        # Python traceback: File "/path/to/file.py", line 123 (handles both / and \)
+        FilePattern(
+            re.compile(r'File "(?P<file>[^"\r\n]+\.(?:py|pyx))", line (?P<line>\d+)'),
+            ('File "',),
+            True,
+        ),
+        # Linters/type checkers with quoted files: mypy: "src/types.py" or "src\types.py"
+        FilePattern(
+            re.compile(r'(?:mypy|ruff|pylint|flake8|pyright|black):[^\S\r\n]+"(?P<file>[^"\r\n]+)"'),
+            ("mypy:", "ruff:", "pylint:", "flake8:", "pyright:", "black:"),
+            False,
+        ),
+        # Node.js stack: at /path/to/file.js:123:45 or at C:\path\file.js:123:45
+        FilePattern(
+            re.compile(
+                rf"at (?P<file>{PATH_PATTERN}\.(?:{'|'.join(_NODE_EXTENSIONS)})):(?P<line>\d+):\d+"
+            ),
+            tuple(f".{ext}:" for ext in _NODE_EXTENSIONS),
+            True,
+        ),
+        # Webpack: Module not found: Error: Can't resolve './src' or '.\src'
+        FilePattern(
+            re.compile(rf"Can't resolve ['\"](?P<file>{PATH_PATTERN})['\"]"),
+            ("Can't resolve",),
+            False,
+        ),
+        # PHP errors: in /path/to/file.php on line 4
+        FilePattern(
+            re.compile(rf" in (?P<file>{PATH_PATTERN}\.php) on line (?P<line>\d+)"),
+            (" on line ",),
+            True,
+        ),
+        # Dockerfile errors: Dockerfile:4
+        FilePattern(
+            re.compile(r"(?P<file>Dockerfile(?:\.[a-z]+)?):(?P<line>\d+)"), ("Dockerfile",), True
+        ),
+        # Common extensionless files: Makefile, CMakeLists.txt
+        FilePattern(
+            re.compile(r"(?P<file>(?:Makefile|CMakeLists\.txt|Gemfile|Rakefile)):(?P<line>\d+)"),
+            ("Makefile:", "CMakeLists.txt:", "Gemfile:", "Rakefile:"),
+            True,
+        ),
+        # Generic file mention: checking src/main.py or src\main.py
+        # (keywords such as "in" are too common to gate on; the extension is required)
+        FilePattern(
+            re.compile(rf"(?:checking|in|file|from|import)[^\S\r\n]+(?P<file>{PATH_PATTERN}\.(?:{'|'.join(_MENTION_EXTENSIONS)}))"),
+            tuple(f".{ext}" for ext in _MENTION_EXTENSIONS),
+            False,
+        ),
+        # --- Untethered patterns (no leading literal) ---
+        # .NET/C# errors: Program.cs(10,31): error CS0103 or C:\path\Program.cs(10,31)
+        FilePattern(
+            re.compile(rf"(?P<file>{PATH_PATTERN}\.cs)\((?P<line>\d+),\d+\):"), (".cs(",), True
+        ),
+        # Generic: file.py:123 or file.py:123:45 (Windows: C:\path\file.py:123)
+        FilePattern(
+            re.compile(rf"(?P<file>{PATH_PATTERN}\.(?:{'|'.join(_LOCATION_EXTENSIONS)})):(?P<line>\d+)(?::\d+)?"),
+            tuple(f".{ext}:" for ext in _LOCATION_EXTENSIONS),
+            True,
+        ),
+    )
+
+
+# ANSI escape codes (color, bold, etc.)
+# GitHub Actions and most CI systems colorize output, which breaks pattern matching
+# Example: \x1b[1m\x1b[92mCompiling\x1b[0m → Compiling
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
+
+# Rust/Cargo working directory
+# Matches: Compiling rust-app v0.1.0 (/home/runner/work/repo/repo/rust-app)
+# Handles:
+# - Optional GitHub Actions timestamp prefix: 2025-12-10T08:16:46.5215607Z
+# - Flexible whitespace between timestamp and "Compiling"
+# - Any Rust package name and version format
+# - Cross-platform paths (Unix and Windows)
+_RUST_WD_RE = re.compile(
+    r"""
+    (?:^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s+)?  # Optional timestamp
+    Compiling\s+                                          # "Compiling"
+    \S+\s+                                                # Package name
+    v[\d.]+(?:-[a-zA-Z0-9.]+)?\s+                        # Version (v0.1.0)
+    \(                                                    # Opening paren
+    (?P<full_path>.*?/(?P<parent>[^/]+)/(?P<last>[^/\)]+))  # Path parts
+    \)                                                    # Closing paren
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Go test working directory
+# Matches: FAIL    example.com/go-app    0.002s
+_GO_WD_RE = re.compile(r"^FAIL\s+\S+/(\S+?)\s+[\d.]+s$", re.MULTILINE)
+
+# Drive letters of Windows absolute paths (C:/..., after backslash conversion)
+_DRIVE_LETTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz")
+
+
+# System/library locations that never hold project files. One alternation scans
+# the path once instead of one substring search per entry ("venv/" also
+# covers ".venv/").
+_SYSTEM_PATH_RE = re.compile(r"/(?:usr|opt|lib|node_modules)/|site-packages/|venv/")
+
+# Common JDK/library class names that show up in Java stack traces
+_JAVA_LIBRARY_FILES = frozenset({
+    "ArrayList.java", "HashMap.java", "Method.java", "Class.java",
+    "String.java", "Integer.java", "Object.java", "Thread.java",
+    "AssertEquals.java", "Assertions.java", "AssertionFailureBuilder.java",
+    "Test.java", "Before.java", "After.java", "Suite.java",
+})
+
+# Directory prefixes that may sit below an unlogged project subdirectory
+_GENERIC_STARTS = ("src/", "tests/", "test/", "lib/", "pkg/", "internal/", "cmd/")
+
+# Prefixes of paths that are accepted as project files outright
+_VALID_STARTS = ("src/", "tests/", "test/", "lib/", "app/", "./", "../", "pkg/")
+
+# Common extensionless files in the repository root (also matched with a suffix)
+_EXTENSIONLESS_FILES = ("Dockerfile", "Makefile", "Gemfile", "Rakefile", "CMakeLists.txt")
+_EXTENSIONLESS_PREFIXES = tuple(name + "." for name in _EXTENSIONLESS_FILES)
+
+# Recognized source code extensions, as suffixes for a single str.endswith() call
+_SOURCE_EXT_SUFFIXES = tuple(
+    "." + ext
+    for ext in (
+        "py", "js", "ts", "tsx", "jsx", "go", "rs", "rb", "java",
+        "cpp", "c", "h", "cs", "php", "swift", "kt", "scala",
+        "pyx", "cc", "hpp", "cxx",
+    )
+)
 
 
 def parse_affected_files(log_content: str) -> list[AffectedFile]:
@@ -65,40 +221,432 @@ def parse_affected_files(log_content: str) -> list[AffectedFile]:
     Returns:
         List of unique affected files with line numbers
     """
-    affected_files: set[AffectedFile] = set()
+    if not log_content:
+        return []
+
+    # Only patterns whose literals occur somewhere in the log can ever match.
+    # Checked before anything else, so logs that can't mention a file cost a
+    # few substring scans and nothing more.
+    active = _active_patterns(log_content.__contains__)
+    if not active:
+        return []
 
     # Try to detect working directory from build tool output
     working_dir = _extract_working_directory(log_content)
 
-    for pattern in FILE_PATTERNS:
-        for match in pattern.finditer(log_content):
-            file_path = match.group("file")
-            line_num = None
+    return _scan_lines(log_content, active, working_dir)
 
-            # Try to extract line number if present
-            try:
-                line_str = match.group("line")
-                line_num = int(line_str) if line_str else None
-            except (IndexError, ValueError):
-                pass
 
-            # Normalize and validate file path
-            normalized_path = _normalize_file_path(file_path)
+# Logs shorter than this are parsed in-process: below it, starting workers and
+# pickling chunks costs more than the scan itself
+_PARALLEL_MIN_SIZE = 1_000_000
+
+
+def parse_affected_files_parallel(
+    log_content: str, workers: int | None = None
+) -> list[AffectedFile]:
+    """Extract file paths and line numbers from a large log using several processes.
+
+    The log is split into one chunk per worker at line boundaries and the
+    chunks are scanned in a process pool. The working directory is detected
+    once on the full log and shared with every chunk, so results match
+    parse_affected_files(). Logs under 1 MB are parsed sequentially.
+
+    Args:
+        log_content: Raw or preprocessed log content
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        List of unique affected files with line numbers
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(log_content) < _PARALLEL_MIN_SIZE:
+        return parse_affected_files(log_content)
+
+    active = _active_patterns(log_content.__contains__)
+    if not active:
+        return []
+
+    # Imported here: the process pool machinery is only needed for very large logs
+    from concurrent.futures import ProcessPoolExecutor
+
+    working_dir = _extract_working_directory(log_content)
+    chunks = _split_at_lines(log_content, workers)
+
+    affected_files = _SortedFiles()
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        for chunk_files in pool.map(_scan_lines, chunks, repeat(active), repeat(working_dir)):
+            for affected_file in chunk_files:
+                affected_files.add((affected_file.file_path, affected_file.line_start))
+
+    return affected_files.files()
+
+
+# Smallest log worth shipping to a worker process in parse_affected_files_many
+_MANY_MIN_SIZE = 256_000
+
+
+def parse_affected_files_many(
+    logs: list[str], workers: int | None = None
+) -> list[list[AffectedFile]]:
+    """Extract file paths and line numbers from several independent logs.
+
+    Logs of 256 KB and more are parsed in a process pool, one log per task;
+    smaller ones cost less to parse than to pickle, so they are parsed in this
+    process while the pool works. With fewer than two large logs everything is
+    parsed sequentially.
+
+    Args:
+        logs: Raw or preprocessed log contents, e.g. one per failed job
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        Affected files of each log, in the order of logs
+    """
+    workers = workers or os.cpu_count() or 1
+    large = [index for index, log in enumerate(logs) if len(log) >= _MANY_MIN_SIZE]
+    if workers < 2 or len(large) < 2:
+        return [parse_affected_files(log) for log in logs]
+
+    # Imported here: the process pool machinery is only needed for large batches
+    from concurrent.futures import ProcessPoolExecutor
 
-            # If we have a working directory and path looks incomplete, prepend it
-            if working_dir and normalized_path and _looks_like_incomplete_path(normalized_path):
-                normalized_path = f"{working_dir}/{normalized_path}"
+    results: list[list[AffectedFile]] = [[] for _ in logs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(large))) as pool:
+        pending = pool.map(parse_affected_files, [logs[index] for index in large])
 
-            if normalized_path and _is_valid_file_path(normalized_path):
-                affected_files.add(
-                    AffectedFile(
-                        file_path=normalized_path,
-                        line_start=line_num,
+        for index, log in enumerate(logs):
+            if len(log) < _MANY_MIN_SIZE:
+                results[index] = parse_affected_files(log)
+
+        for index, files in zip(large, pending, strict=True):
+            results[index] = files
+
+    return results
+
+
+def _active_patterns(contains: Callable[[str], bool]) -> tuple[int, ...]:
+    """Return the positions in _file_patterns() that can match the log.
+
+    Logs without any of the characters that every match contains at least one
+    of are rejected first, with a few substring scans. Beyond that, with RE2
+    the joined alternation costs the same whatever the number of alternatives,
+    so probing the log for every pattern's literals would only add full scans
+    and all patterns are used. Without RE2, patterns none of whose literals
+    occur in the log are dropped.
+
+    Args:
+        contains: Substring test against the log content
+
+    Returns:
+        Positions in _file_patterns() to scan with
+    """
+    if not any(map(contains, _MATCH_CHARACTERS)):
+        return ()
+
+    patterns = _file_patterns()
+    if _linear_re is not re:
+        return tuple(range(len(patterns)))
+
+    return tuple(
+        index
+        for index, entry in enumerate(patterns)
+        if any(contains(literal) for literal in entry.literals)
+    )
+
+
+class _SortedFiles:
+    """Unique affected files, kept sorted by (file_path, line_start) as they are added.
+
+    Locations are inserted with bisect as they are found, so results come out
+    ordered without a key-function sort at the end. Files without a line number
+    sort before line 0 of the same file.
+    """
+
+    __slots__ = ("_entries", "_seen")
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, int, bool, AffectedFile]] = []
+        # Repeated mentions of the same location (common in tracebacks printed
+        # per test) are skipped with one set lookup
+        self._seen: set[tuple[str, int | None]] = set()
+
+    def add(self, location: tuple[str, int | None]) -> None:
+        """Add a (file_path, line_start) location unless it was already seen."""
+        if location in self._seen:
+            return
+        self._seen.add(location)
+
+        file_path, line_start = location
+        # (path, line, has_line) is unique per location, so the AffectedFile
+        # itself is never compared
+        insort(
+            self._entries,
+            (
+                file_path,
+                line_start or 0,
+                line_start is not None,
+                AffectedFile(file_path=file_path, line_start=line_start),
+            ),
+        )
+
+    def files(self) -> list[AffectedFile]:
+        """Return the affected files in sorted order."""
+        return [entry[3] for entry in self._entries]
+
+
+def _scan_lines(
+    log_content: str, active: tuple[int, ...], working_dir: str | None
+) -> list[AffectedFile]:
+    """Run the active patterns over each line of the log.
+
+    Args:
+        log_content: Log content (or a chunk of it, split at line boundaries)
+        active: Positions in _file_patterns() to run
+        working_dir: Working directory for incomplete paths, if detected
+
+    Returns:
+        List of unique affected files, sorted by file path and line
+    """
+    affected_files = _SortedFiles()
+
+    for finder, entries in _scan_plan(active):
+        for line in _candidate_lines(log_content, finder):
+            for entry in entries:
+                for match in entry.pattern.finditer(line):
+                    location = _resolve_location(
+                        match.group("file"),
+                        match.group("line") if entry.has_line_group else None,
+                        working_dir,
                     )
-                )
+                    if location:
+                        affected_files.add(location)
+
+    return affected_files.files()
+
+
+def _candidate_lines(text: str, finder: re.Pattern[str]) -> Iterator[str]:
+    """Yield each line of text that contains a finder hit, once per line.
+
+    Running the finder over the whole log is much cheaper than running the
+    file patterns over every line, so only lines with a hit are cut out and
+    handed to them. The log is scanned with a single finditer() call: RE2
+    re-encodes its whole input on every search(), so searching from one hit
+    to the next would be quadratic.
+    """
+    line_end = -1
+    for hit in finder.finditer(text):
+        # Hits never span lines, so one starting before line_end is on the last line
+        if hit.start() < line_end:
+            continue
+        line_start = text.rfind("\n", 0, hit.start()) + 1
+        line_end = text.find("\n", hit.end())
+        if line_end == -1:
+            line_end = len(text)
+        yield text[line_start:line_end]
+
+
+def _split_at_lines(text: str, parts: int) -> list[str]:
+    """Split text into at most `parts` chunks of similar size, at line boundaries."""
+    chunk_size = len(text) // parts + 1
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + chunk_size)
+        end = len(text) if end == -1 else end + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+# Literals of lines that can reveal the working directory (see _extract_working_directory)
+_WORKING_DIR_LITERALS = (b"Compiling", b"FAIL")
+
+
+def parse_affected_files_from_file(path: str | os.PathLike[str]) -> list[AffectedFile]:
+    """Extract file paths and line numbers from a log file on disk.
+
+    Equivalent to parse_affected_files(), but memory-maps the file instead of
+    loading the whole log into a str. Lines are searched for the patterns'
+    literals as bytes, and only the lines with a hit (plus the few that can
+    reveal the working directory) are decoded and matched with the str
+    patterns, so non-ASCII paths come out as they do from the str parser.
+
+    Args:
+        path: Path to the raw log file
+
+    Returns:
+        List of unique affected files with line numbers
+    """
+    with open(path, "rb") as log_file:
+        # mmap refuses to map empty files
+        if os.fstat(log_file.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+            active = _active_patterns(lambda literal: log_map.find(literal.encode()) != -1)
+            if not active:
+                return []
+
+            scan_plan = _bytes_scan_plan(active)
+
+            # Matches are resolved after the scan, once the working directory is known
+            raw_locations: dict[tuple[str, str | None], None] = {}
+            working_dir_lines: list[bytes] = []
+
+            for line in iter(log_map.readline, b""):
+                if any(literal in line for literal in _WORKING_DIR_LITERALS):
+                    working_dir_lines.append(line)
+
+                # Decoded on the first prematcher hit; UTF-8 never splits a
+                # character across b"\n", so this matches decoding the whole log
+                text: str | None = None
+                for prematcher, entry in scan_plan:
+                    if not prematcher.search(line):
+                        continue
+                    if text is None:
+                        text = line.decode("utf-8", "replace")
+
+                    for match in entry.pattern.finditer(text):
+                        raw_line = match.group("line") if entry.has_line_group else None
+                        raw_locations.setdefault((match.group("file"), raw_line))
+
+    working_dir = _extract_working_directory(
+        b"".join(working_dir_lines).decode("utf-8", "replace")
+    )
+
+    affected_files = _SortedFiles()
+    for raw_file, raw_line in raw_locations:
+        location = _resolve_location(raw_file, raw_line, working_dir)
+        if location:
+            affected_files.add(location)
+
+    return affected_files.files()
+
+
+# One scan: (finder whose hits mark the candidate lines, patterns to run on them)
+_Scan = tuple[re.Pattern[str], tuple[FilePattern, ...]]
+# Bytes scan for one pattern: (literal prematcher for raw lines, the pattern)
+_BytesScan = tuple[re.Pattern[bytes], FilePattern]
 
-    # Sort by file path for consistent output
-    return sorted(affected_files, key=lambda f: (f.file_path, f.line_start or 0))
+
+@lru_cache(maxsize=64)
+def _scan_plan(indices: tuple[int, ...]) -> tuple[_Scan, ...]:
+    """Build the scans to run over the log for the given file patterns.
+
+    RE2 runs an alternation as a single DFA pass, so with RE2 one scan finds
+    the lines that any pattern matches on, and every pattern then runs on
+    those lines. The stdlib engine tries alternatives one by one at every
+    position and loses its literal-prefix search, which makes a joined
+    pattern slow; there each pattern gets its own scan, limited to the lines
+    matched by a prematcher built from its literals. Either way the patterns
+    run separately, so overlapping matches of different patterns are all
+    kept. Cached per set of indices, since most logs activate the same
+    handful of patterns.
+
+    Args:
+        indices: Positions in _file_patterns() to include
+
+    Returns:
+        Tuple of scans
+    """
+    patterns = _file_patterns()
+    if _linear_re is not re:
+        finder = _linear_re.compile(_finder_source(indices))
+        return ((finder, tuple(patterns[i] for i in indices)),)
+
+    return tuple((_literal_prematcher(patterns[i].literals), (patterns[i],)) for i in indices)
+
+
+@lru_cache(maxsize=64)
+def _bytes_scan_plan(indices: tuple[int, ...]) -> tuple[_BytesScan, ...]:
+    """Bytes counterpart of _scan_plan, for scanning memory-mapped logs.
+
+    The map is read line by line, so there is no whole-log pass for RE2 to
+    speed up: each pattern's literals are searched for in the raw bytes, and
+    the str pattern runs on the decoded lines with a hit.
+
+    Args:
+        indices: Positions in _file_patterns() to include
+
+    Returns:
+        Tuple of scans, one per pattern
+    """
+    patterns = _file_patterns()
+    return tuple(
+        (re.compile(_literal_prematcher(patterns[i].literals).pattern.encode()), patterns[i])
+        for i in indices
+    )
+
+
+def _literal_prematcher(literals: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile a plain alternation of a pattern's literals."""
+    return re.compile("|".join(re.escape(literal) for literal in literals))
+
+
+# Stdlib class escapes are Unicode-aware on str patterns, while RE2's are ASCII-only
+# ("src/données/app.py" would only match from "es/"). The finder spells them as RE2
+# Unicode classes that match at least the same characters, so it never misses a line
+# the stdlib patterns match on. \w only ever appears inside a character class.
+_RE2_CLASSES = {
+    r"\w": r"\p{L}\p{N}_",
+    r"\d": r"\p{Nd}",
+    r"[^\S\r\n]": r"[\t\x0b\x0c\x1c-\x1f \x85\p{Z}]",
+}
+_RE2_CLASS_RE = re.compile(r"\[\^\\S\\r\\n\]|\\.")
+
+
+def _finder_source(indices: tuple[int, ...]) -> str:
+    """Join the selected file patterns into one RE2 alternation without named groups.
+
+    The alternation is only used to find the lines worth scanning, so its
+    groups are never read, and RE2 rejects the repeated group names.
+
+    Args:
+        indices: Positions in _file_patterns() to include
+
+    Returns:
+        Pattern source of the alternation
+    """
+    patterns = _file_patterns()
+    source = "|".join(patterns[i].pattern.pattern for i in indices)
+    source = source.replace("(?P<file>", "(?:").replace("(?P<line>", "(?:")
+    return _RE2_CLASS_RE.sub(lambda token: _RE2_CLASSES.get(token.group(), token.group()), source)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_location(
+    file_path: str, line_str: str | None, working_dir: str | None
+) -> tuple[str, int | None] | None:
+    """Resolve a matched path to a project file location.
+
+    Cached like the path helpers it calls: tracebacks repeat the same
+    file:line many times, and each repeat then costs a single lookup. The
+    resolved path is interned, so different spellings of one file ("./a.py",
+    "a.py") share a string object and compare by identity when deduplicated
+    and sorted.
+
+    Args:
+        file_path: Raw file path captured from the log
+        line_str: Captured line number, if the pattern has one
+        working_dir: Detected project subdirectory, if any
+
+    Returns:
+        (file_path, line_number) for a valid project path, or None if it should be skipped
+    """
+    line_num = int(line_str) if line_str else None
+
+    # Normalize and validate file path
+    normalized_path = _normalize_file_path(file_path)
+
+    # If we have a working directory and path looks incomplete, prepend it
+    if working_dir and normalized_path and _looks_like_incomplete_path(normalized_path):
+        normalized_path = f"{working_dir}/{normalized_path}"
+
+    if normalized_path and _is_valid_file_path(normalized_path):
+        return sys.intern(normalized_path), line_num
+
+    return None
 
 
 def _extract_working_directory(log_content: str) -> str | None:
@@ -123,32 +671,11 @@ def _extract_working_directory(log_content: str) -> str | None:
         - Root-level project (not in subdirectory)
     """
     # Step 1: Strip ANSI escape codes (color, bold, etc.)
-    # GitHub Actions and most CI systems colorize output, which breaks pattern matching
-    # Example: \x1b[1m\x1b[92mCompiling\x1b[0m → Compiling
-    ansi_escape = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
-    clean_content = ansi_escape.sub("", log_content)
+    # Skip the regex pass entirely for uncolored logs (e.g., file-captured output)
+    clean_content = _ANSI_RE.sub("", log_content) if "\x1b" in log_content else log_content
 
     # Step 2: Rust/Cargo working directory detection
-    # Matches: Compiling rust-app v0.1.0 (/home/runner/work/repo/repo/rust-app)
-    # Handles:
-    # - Optional GitHub Actions timestamp prefix: 2025-12-10T08:16:46.5215607Z
-    # - Flexible whitespace between timestamp and "Compiling"
-    # - Any Rust package name and version format
-    # - Cross-platform paths (Unix and Windows)
-    rust_pattern = re.compile(
-        r"""
-        (?:^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s+)?  # Optional timestamp
-        Compiling\s+                                          # "Compiling"
-        \S+\s+                                                # Package name
-        v[\d.]+(?:-[a-zA-Z0-9.]+)?\s+                        # Version (v0.1.0)
-        \(                                                    # Opening paren
-        (?P<full_path>.*?/(?P<parent>[^/]+)/(?P<last>[^/\)]+))  # Path parts
-        \)                                                    # Closing paren
-        """,
-        re.MULTILINE | re.VERBOSE
-    )
-
-    match = rust_pattern.search(clean_content)
+    match = _RUST_WD_RE.search(clean_content) if "Compiling" in clean_content else None
     if match:
         parent = match.group("parent")
         last = match.group("last")
@@ -161,9 +688,7 @@ def _extract_working_directory(log_content: str) -> str | None:
             return last
 
     # Step 3: Go test working directory detection
-    # Matches: FAIL    example.com/go-app    0.002s
-    go_pattern = re.compile(r"^FAIL\s+\S+/(\S+?)\s+[\d.]+s$", re.MULTILINE)
-    match = go_pattern.search(clean_content)
+    match = _GO_WD_RE.search(clean_content) if "FAIL" in clean_content else None
     if match:
         return match.group(1)
 
@@ -187,10 +712,10 @@ def _looks_like_incomplete_path(path: str) -> bool:
         return True
 
     # Common generic directory structures that might be in subdirectories
-    generic_starts = ("src/", "tests/", "test/", "lib/", "pkg/", "internal/", "cmd/")
-    return any(path.startswith(prefix) for prefix in generic_starts)
+    return path.startswith(_GENERIC_STARTS)
 
 
+@lru_cache(maxsize=4096)
 def _normalize_file_path(path: str) -> str | None:
     r"""Normalize file paths to relative project paths (cross-platform).
 
@@ -203,67 +728,87 @@ def _normalize_file_path(path: str) -> str | None:
     Returns:
         Normalized relative path with forward slashes, or None if path is invalid
     """
-    # First, normalize backslashes to forward slashes for consistent processing
+    # Fast path: most matches are already plain relative paths. Anything that
+    # could need rewriting has a backslash, a leading "/" or ".", a drive
+    # colon, or a runner home directory in it.
+    if (
+        "\\" not in path
+        and path[:1] not in ("/", ".")
+        and path[1:2] != ":"
+        and "/home/" not in path
+    ):
+        return path
+
+    # Normalize backslashes to forward slashes for consistent processing
     normalized = path.replace("\\", "/")
+    head = normalized[:1]
+    is_drive_path = normalized[1:3] == ":/" and head in _DRIVE_LETTERS
 
     # Windows GitHub Actions: D:/a/{repo}/{repo}/... (after backslash conversion)
     # Example: D:/a/myrepo/myrepo/src/file.py -> src/file.py
-    if re.match(r"^[A-Za-z]:/a/", normalized):
+    if is_drive_path and normalized[3:5] == "a/":
         parts = normalized.split("/")
         # Structure: ['D:', 'a', 'repo', 'repo', 'src', 'file.py']
         # Skip drive, 'a', repo name, repo name again (first 4 parts)
         if len(parts) > 4:
             return "/".join(parts[4:])
 
-    # Linux GitHub Actions workspace: /home/runner/work/{repo}/{repo}/...
-    # Extract relative path after the second occurrence of repo name
-    if "/home/runner/work/" in normalized:
-        parts = normalized.split("/")
-        try:
-            work_idx = parts.index("work")
-            # Skip 'work', repo name, repo name again, then take the rest
-            if len(parts) > work_idx + 3:
-                return "/".join(parts[work_idx + 3 :])
-        except (ValueError, IndexError):
-            pass
-
-    # Jenkins/other CI: /workspace/...
-    if normalized.startswith("/workspace/"):
-        return normalized.replace("/workspace/", "", 1)
-
-    # CircleCI: /home/circleci/project/...
-    if "/home/circleci/project/" in normalized:
-        return normalized.split("/home/circleci/project/", 1)[1]
+    if "/home/" in normalized:
+        # Linux GitHub Actions workspace: /home/runner/work/{repo}/{repo}/...
+        # Extract relative path after the second occurrence of repo name
+        if "/home/runner/work/" in normalized:
+            parts = normalized.split("/")
+            try:
+                work_idx = parts.index("work")
+                # Skip 'work', repo name, repo name again, then take the rest
+                if len(parts) > work_idx + 3:
+                    return "/".join(parts[work_idx + 3 :])
+            except (ValueError, IndexError):
+                pass
+
+        # CircleCI: /home/circleci/project/...
+        # (Jenkins-style /workspace/ paths take precedence, as they always have)
+        if "/home/circleci/project/" in normalized and not normalized.startswith("/workspace/"):
+            return normalized.split("/home/circleci/project/", 1)[1]
+
+    if head == "/":
+        # Jenkins/other CI: /workspace/...
+        if normalized.startswith("/workspace/"):
+            return normalized[len("/workspace/") :]
+
+        # Unknown absolute paths (not CI workspace) are likely not resolvable
+        return None
 
     # Strip Windows drive letter for absolute paths (C:/project/src -> project/src)
     # But keep paths that are already relative
-    drive_match = re.match(r"^[A-Za-z]:/(.+)", normalized)
-    if drive_match:
+    if is_drive_path and len(normalized) > 3:
         # This is a Windows absolute path - try to extract repo-relative part
         # Common pattern: C:/Users/runner/project/src/file.py
-        remaining_path = drive_match.group(1)
+        remaining_path = normalized[3:]
         # If it contains common workspace indicators, try to extract from there
         if "/project/" in remaining_path:
             return remaining_path.split("/project/", 1)[1]
         # Otherwise, just remove the drive letter and hope it's relative-ish
         return remaining_path
 
-    # Clean relative path prefixes
-    if normalized.startswith("./"):
-        normalized = normalized[2:]  # Remove ./
+    if head == ".":
+        # Clean relative path prefixes
+        if normalized.startswith("./"):
+            normalized = normalized[2:]  # Remove ./
 
-    # Parent directory references are not resolvable in repo context
-    if normalized.startswith("../"):
-        return None
+        # Parent directory references are not resolvable in repo context
+        if normalized.startswith("../"):
+            return None
 
-    # Unknown absolute paths (not CI workspace) are likely not resolvable
-    if normalized.startswith("/"):
-        return None
+        # "./" followed by an absolute path ("./" + "/x") is not resolvable either
+        if normalized.startswith("/"):
+            return None
 
     # Already relative or simple path
     return normalized
 
 
+@lru_cache(maxsize=4096)
 def _is_valid_file_path(path: str) -> bool:
     """Filter out false positives.
 
@@ -273,69 +818,36 @@ def _is_valid_file_path(path: str) -> bool:
     Returns:
         True if path looks like a real project file
     """
-    # Skip system/library paths
-    if any(
-        skip in path
-        for skip in [
-            "/usr/",
-            "/opt/",
-            "/lib/",
-            "/node_modules/",
-            "site-packages/",
-            ".venv/",
-            "venv/",
-        ]
-    ):
+    # Must have a reasonable length (checked first: it's free, and it bounds the
+    # regex scan below)
+    if not 3 <= len(path) <= 200:
         return False
 
-    # Must have a reasonable length
-    if len(path) < 3 or len(path) > 200:
+    # Skip system/library paths
+    if _SYSTEM_PATH_RE.search(path):
         return False
 
     # Filter out common Java/JDK library files (from stack traces)
     if path.endswith(".java"):
-        # Common JDK/library class names that should be filtered
-        java_library_files = {
-            "ArrayList.java", "HashMap.java", "Method.java", "Class.java",
-            "String.java", "Integer.java", "Object.java", "Thread.java",
-            "AssertEquals.java", "Assertions.java", "AssertionFailureBuilder.java",
-            "Test.java", "Before.java", "After.java", "Suite.java",
-        }
-        filename = path.split("/")[-1]  # Get just the filename
-        if filename in java_library_files:
+        filename = path.rpartition("/")[2]  # Get just the filename
+        if filename in _JAVA_LIBRARY_FILES:
             return False
 
     # Should start with typical project paths or be relative
-    valid_starts = ("src/", "tests/", "test/", "lib/", "app/", "./", "../", "pkg/")
-    if path.startswith(valid_starts):
+    if path.startswith(_VALID_STARTS):
         return True
 
     # Common extensionless files in root
-    extensionless_files = (
-        "Dockerfile",
-        "Makefile",
-        "Gemfile",
-        "Rakefile",
-        "CMakeLists.txt",
-    )
-    for valid_file in extensionless_files:
-        if path == valid_file or path.startswith(valid_file + "."):
-            return True
+    if path in _EXTENSIONLESS_FILES or path.startswith(_EXTENSIONLESS_PREFIXES):
+        return True
 
     # Or be a simple filename in root with extension
     if "/" not in path and "." in path:
         return True
 
     # Or have a recognized source code extension (likely project file)
-    if "." in path:
-        ext = path.rsplit(".", 1)[1]
-        source_extensions = {
-            "py", "js", "ts", "tsx", "jsx", "go", "rs", "rb", "java",
-            "cpp", "c", "h", "cs", "php", "swift", "kt", "scala",
-            "pyx", "cc", "hpp", "cxx"
-        }
-        if ext in source_extensions:
-            return True
+    if path.endswith(_SOURCE_EXT_SUFFIXES):
+        return True
 
     return False
 
@@ -358,29 +870,68 @@ def format_github_link(
     Returns:
         Markdown formatted link to GitHub file or search
     """
-    # Check if we have a directory path or just a filename
-    has_directory = "/" in file.file_path
-
-    if has_directory:
-        # Strategy 1: Direct link to file (we have relative path)
-        base_url = f"https://github.com/{repo_owner}/{repo_name}/blob/{commit_sha}/{file.file_path}"
-
-        # Add line anchor if available
-        if file.line_start:
-            if file.line_end and file.line_end != file.line_start:
-                # Range: #L10-L15
-                line_anchor = f"#L{file.line_start}-L{file.line_end}"
-                display = f"{file.file_path}:{file.line_start}-{file.line_end}"
-            else:
-                # Single line: #L10
-                line_anchor = f"#L{file.line_start}"
-                display = f"{file.file_path}:{file.line_start}"
-            return f"[`{display}`]({base_url}{line_anchor})"
+    repo_url = f"https://github.com/{repo_owner}/{repo_name}"
+    return _github_link(file, repo_url, f"{repo_url}/blob/{commit_sha}/")
+
+
+def format_github_links(
+    files: list[AffectedFile],
+    repo_owner: str,
+    repo_name: str,
+    commit_sha: str,
+    sep: str = "\n",
+) -> str:
+    """Generate GitHub links for several files, joined into one string.
+
+    Same links as format_github_link(), with the repository URLs built once
+    for the whole batch.
+
+    Args:
+        files: Affected files with path and line info
+        repo_owner: GitHub repository owner
+        repo_name: GitHub repository name
+        commit_sha: Git commit SHA
+        sep: Separator placed between links
+
+    Returns:
+        Markdown formatted links, in the order of files
+    """
+    repo_url = f"https://github.com/{repo_owner}/{repo_name}"
+    blob_url = f"{repo_url}/blob/{commit_sha}/"
+    return sep.join([_github_link(file, repo_url, blob_url) for file in files])
+
+
+def _github_link(file: AffectedFile, repo_url: str, blob_url: str) -> str:
+    """Generate the markdown link for one file.
+
+    Args:
+        file: Affected file with path and line info
+        repo_url: https://github.com/{owner}/{repo}
+        blob_url: {repo_url}/blob/{sha}/
+
+    Returns:
+        Markdown formatted link to GitHub file or search
+    """
+    file_path = file.file_path
+
+    # Strategy 2: Search link (only filename, path not resolved)
+    # Use path: qualifier (filename: is deprecated) and restrict to code search
+    if "/" not in file_path:
+        display = f"{file_path}:{file.line_start}" if file.line_start else file_path
+        return (
+            f"[`{display}`]({repo_url}/search?q=path:{file_path}&type=code) _(open as search)_"
+        )
+
+    # Strategy 1: Direct link to file (we have relative path), with a line
+    # anchor if available: #L10 for a single line, #L10-L15 for a range
+    line_anchor = ""
+    display = file_path
+    if file.line_start:
+        if file.line_end and file.line_end != file.line_start:
+            line_anchor = f"#L{file.line_start}-L{file.line_end}"
+            display = f"{file_path}:{file.line_start}-{file.line_end}"
         else:
-            return f"[`{file.file_path}`]({base_url})"
-    else:
-        # Strategy 2: Search link (only filename, path not resolved)
-        # Use path: qualifier (filename: is deprecated) and restrict to code search
-        search_url = f"https://github.com/{repo_owner}/{repo_name}/search?q=path:{file.file_path}&type=code"
-        display = f"{file.file_path}:{file.line_start}" if file.line_start else file.file_path
-        return f"[`{display}`]({search_url}) _(open as search)_"
+            line_anchor = f"#L{file.line_start}"
+            display = f"{file_path}:{file.line_start}"
+
+    return f"[`{display}`]({blob_url}{file_path}{line_anchor})"
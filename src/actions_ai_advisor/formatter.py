@@ -1,11 +1,30 @@
 """Output formatting module for Job Summary."""
 
 import os
+from functools import lru_cache
 
-from actions_ai_advisor.file_parser import AffectedFile, format_github_link
+from actions_ai_advisor.file_parser import AffectedFile, format_github_links
 from actions_ai_advisor.llm_client import AnalysisResult
 from actions_ai_advisor.log_fetcher import JobLog
 
+# Markdown skeleton of a job's analysis; filled in by format_analysis
+_LAYOUT = """# Actions AI Advisor
+
+{header}
+{files}
+---
+
+{analysis}
+
+---
+
+### Analysis Details
+
+{tokens}
+
+<sub>Powered by Actions AI Advisor | [Report Issues](https://github.com/ratibor78/actions-ai-advisor/issues)</sub>
+"""
+
 
 def format_analysis(
     job_log: JobLog,
@@ -46,50 +65,36 @@ def format_analysis(
     )
 
     # Build token and cost info (compact single line)
+    cached_str = ""
+    if result.cached_input_tokens:
+        cached_str = f" ({result.cached_input_tokens:,} cached)"
     token_info = (
         f"**Model:** `{result.model_used}` | "
-        f"**Tokens:** {result.input_tokens:,} in + {result.output_tokens:,} out | "
+        f"**Tokens:** {result.input_tokens:,} in{cached_str} + {result.output_tokens:,} out | "
         f"**Cost:** {cost_str}"
     )
 
     # Build affected files section (if available)
     affected_files_section = ""
     if affected_files and repo_owner and repo_name and commit_sha:
-        # Limit to top 10 files to keep summary concise
-        files_to_show = affected_files[:10]
-        file_links = [
-            f"- {format_github_link(f, repo_owner, repo_name, commit_sha)}"
-            for f in files_to_show
-        ]
-
-        if file_links:
-            # Clean formatting without extra blank lines
-            affected_files_section = (
-                "\n### Affected Files\n\n"
-                f"{chr(10).join(file_links)}\n\n"
-            )
-
-    # Build markdown output
-    markdown = f"""# Actions AI Advisor
-
-{failure_header}
-{affected_files_section}
----
-
-{result.analysis}
-
----
-
-### Analysis Details
-
-{token_info}
-
-<sub>Powered by Actions AI Advisor | [Report Issues](https://github.com/ratibor78/actions-ai-advisor/issues)</sub>
-"""
-
-    return markdown
+        # Limit to top 10 files to keep summary concise, one bullet per file
+        file_links = format_github_links(
+            affected_files[:10], repo_owner, repo_name, commit_sha, sep="\n- "
+        )
+        # Clean formatting without extra blank lines
+        affected_files_section = f"\n### Affected Files\n\n- {file_links}\n\n"
+
+    return _LAYOUT.format_map(
+        {
+            "header": failure_header,
+            "files": affected_files_section,
+            "analysis": result.analysis,
+            "tokens": token_info,
+        }
+    )
 
 
+@lru_cache(maxsize=256)
 def _format_duration(seconds: int | None) -> str:
     """Format duration as human-readable string.
 
@@ -105,14 +110,11 @@ def _format_duration(seconds: int | None) -> str:
     if seconds < 60:
         return f"{seconds}s"
 
-    minutes = seconds // 60
-    remaining_seconds = seconds % 60
-
+    minutes, remaining_seconds = divmod(seconds, 60)
     if minutes < 60:
         return f"{minutes}m {remaining_seconds}s"
 
-    hours = minutes // 60
-    remaining_minutes = minutes % 60
+    hours, remaining_minutes = divmod(minutes, 60)
     return f"{hours}h {remaining_minutes}m {remaining_seconds}s"
 
 
@@ -129,6 +131,13 @@ def write_job_summary(content: str) -> None:
         print(content)
         return
 
-    with open(summary_file, "a") as f:
-        f.write(content)
-        f.write("\n\n")
+    # Pre-encoded writes straight to the descriptor: no buffered or text layer
+    # is set up, and the append is normally a single syscall. os.write may
+    # write less than asked, so the rest is written until nothing is left.
+    payload = memoryview((content + "\n\n").encode("utf-8"))
+    fd = os.open(summary_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload) :]
+    finally:
+        os.close(fd)
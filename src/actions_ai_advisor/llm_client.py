@@ -1,11 +1,30 @@
 """Unified LLM client for multiple providers."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
 
 import httpx
 
 from actions_ai_advisor.log_fetcher import JobLog
 
+_dumps: Callable[[Any], bytes | str]
+_loads: Callable[[bytes], Any]
+try:
+    # Optional faster JSON codec (pip install "actions-ai-advisor[orjson]"); it encodes
+    # straight to bytes and decodes the raw response bytes, skipping the str steps.
+    # Falls back to stdlib json.
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _dumps = json.dumps
+    _loads = json.loads
+
 # Provider API endpoints
 PROVIDER_ENDPOINTS: dict[str, str] = {
     "openai": "https://api.openai.com/v1",
@@ -56,13 +75,20 @@ class AnalysisResult:
     input_tokens: int
     output_tokens: int
     model_used: str
+    # Part of input_tokens served from the provider's prompt cache
+    cached_input_tokens: int = 0
 
 
 class LLMClient:
     """Unified client for LLM providers."""
 
     def __init__(
-        self, provider: str, api_key: str, model: str, base_url: str | None = None
+        self,
+        provider: str,
+        api_key: str,
+        model: str,
+        base_url: str | None = None,
+        client: httpx.AsyncClient | None = None,
     ) -> None:
         """Initialize LLM client.
 
@@ -71,11 +97,41 @@ class LLMClient:
             api_key: API key for authentication
             model: Model name
             base_url: Custom base URL (for selfhosted provider)
+            client: Shared HTTP client, left open for its owner to close
         """
         self.provider = provider
         self.api_key = api_key
         self.model = model
         self.base_url = base_url or PROVIDER_ENDPOINTS.get(provider, "")
+        # Same for every request of this client, so built once
+        self._headers = self._build_headers()
+        # Connection pool: the caller's, or one opened by "async with LLMClient(...)"
+        self._client = client
+        self._owns_client = False
+
+    async def __aenter__(self) -> Self:
+        """Open a connection pool reused by every analyze() call in the block.
+
+        Without it, each call opens (and tears down) its own connection,
+        paying a fresh TCP + TLS handshake per analyzed job. A client passed to
+        the constructor is used as is.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=60.0)
+            self._owns_client = True
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection pool opened by __aenter__."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
 
     async def analyze(self, job_log: JobLog, preprocessed_logs: str) -> AnalysisResult:
         """Analyze failed job logs using LLM.
@@ -105,31 +161,56 @@ class LLMClient:
             "max_tokens": 1500,
         }
 
-        # Build headers
-        headers = self._build_headers()
-
         # Send request
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
+        data = await self._post(f"{self.base_url}/chat/completions", self._headers, payload)
 
         # Extract response
         analysis = data["choices"][0]["message"]["content"]
-        input_tokens = data["usage"]["prompt_tokens"]
-        output_tokens = data["usage"]["completion_tokens"]
+        usage = data["usage"]
+        input_tokens = usage["prompt_tokens"]
+        output_tokens = usage["completion_tokens"]
+        # OpenAI-style usage reports cache hits in prompt_tokens_details,
+        # Anthropic-style usage as cache_read_input_tokens
+        details = usage.get("prompt_tokens_details") or {}
+        cached_input_tokens = (
+            details.get("cached_tokens") or usage.get("cache_read_input_tokens") or 0
+        )
 
         return AnalysisResult(
             analysis=analysis,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             model_used=self.model,
+            cached_input_tokens=cached_input_tokens,
         )
 
+    async def _post(
+        self, url: str, headers: dict[str, str], payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response.
+
+        Uses the shared client when there is one, otherwise a one-off one.
+
+        Args:
+            url: Request URL
+            headers: Request headers
+            payload: JSON request body
+
+        Returns:
+            Decoded response body
+        """
+        # Provider headers already declare the JSON content type
+        body = _dumps(payload)
+        if self._client is not None:
+            response = await self._client.post(url, headers=headers, content=body)
+        else:
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                response = await client.post(url, headers=headers, content=body)
+
+        response.raise_for_status()
+        data: dict[str, Any] = _loads(response.content)
+        return data
+
     def _build_headers(self) -> dict[str, str]:
         """Build provider-specific headers.
 
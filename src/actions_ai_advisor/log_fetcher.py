@@ -1,10 +1,30 @@
 """Module for fetching failed job logs from GitHub API."""
 
-from dataclasses import dataclass
-from typing import Any
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from types import TracebackType
+from typing import Any, Self
 
 import httpx
 
+_loads: Callable[[bytes], Any]
+try:
+    # orjson extra: faster decoding of large job listings (matrix builds)
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+# Upper bound on simultaneous log downloads, to stay clear of GitHub's
+# secondary rate limits on matrix builds with many failed jobs
+MAX_CONCURRENT_LOG_FETCHES = 8
+
 
 @dataclass
 class JobLog:
@@ -21,14 +41,31 @@ class JobLog:
 class LogFetcher:
     """Fetches failed job logs from GitHub API."""
 
-    def __init__(self, github_token: str, repo: str, run_id: str) -> None:
+    def __init__(
+        self,
+        github_token: str,
+        repo: str,
+        run_id: str,
+        client: httpx.AsyncClient | None = None,
+        tail_bytes: int | None = None,
+    ) -> None:
         """Initialize log fetcher.
 
         Args:
             github_token: GitHub token for API authentication
             repo: Repository in format 'owner/repo'
             run_id: GitHub Actions run ID
+            client: Shared HTTP client (must follow redirects), left open for its
+                owner to close; when omitted, "async with LogFetcher(...)" opens
+                one, else each fetch_failed_jobs() call opens its own
+            tail_bytes: Download only this many bytes from the end of each job
+                log. Off by default: the file parser reads the whole log, and
+                file mentions or the Rust/Go working-directory lines early in
+                it would be lost.
         """
+        self._client = client
+        self._owns_client = False
+        self.tail_bytes = tail_bytes
         self.github_token = github_token
         self.repo = repo
         self.run_id = run_id
@@ -39,6 +76,28 @@ class LogFetcher:
             "User-Agent": "actions-ai-advisor",
         }
 
+    async def __aenter__(self) -> Self:
+        """Open a connection pool reused by every fetch_failed_jobs() call in the block.
+
+        A client passed to the constructor is used as is.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+            self._owns_client = True
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection pool opened by __aenter__."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
+
     async def fetch_failed_jobs(self) -> list[JobLog]:
         """Fetch all failed jobs and their logs for the run.
 
@@ -47,63 +106,88 @@ class LogFetcher:
         Returns:
             List of JobLog objects for failed jobs
         """
+        if self._client is not None:
+            return await self._fetch_failed_jobs(self._client)
+
         async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            # Fetch all jobs across all pages (GitHub paginates at 30 per page by default)
-            all_jobs = await self._fetch_all_jobs(client)
-
-            failed_jobs: list[JobLog] = []
-            for job in all_jobs:
-                conclusion = job.get("conclusion")
-                if conclusion in ("failure", "cancelled"):
-                    # Extract job metadata
-                    job_id = job["id"]
-                    job_name = job["name"]
-                    started_at = job.get("started_at")
-                    completed_at = job.get("completed_at")
-
-                    # Calculate duration
-                    duration_seconds = None
-                    if started_at and completed_at:
-                        from datetime import datetime
-
-                        start = datetime.fromisoformat(
-                            started_at.replace("Z", "+00:00")
-                        )
-                        end = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
-                        duration_seconds = int((end - start).total_seconds())
-
-                    # Find failed step
-                    failed_step_name = "Unknown Step"
-                    exit_code = None
-                    for step in job.get("steps", []):
-                        if step.get("conclusion") in ("failure", "cancelled"):
-                            failed_step_name = step.get("name", "Unknown Step")
-                            # Exit code might not always be available
-                            if "number" in step:
-                                exit_code = 1  # Default to 1 for failed steps
-                            break
-
-                    # Fetch logs for this job
-                    raw_logs = await self._fetch_job_logs(client, job_id)
-
-                    failed_jobs.append(
+            return await self._fetch_failed_jobs(client)
+
+    async def _fetch_failed_jobs(self, client: httpx.AsyncClient) -> list[JobLog]:
+        """Fetch failed jobs and their logs using the given client.
+
+        Args:
+            client: HTTP client to use
+
+        Returns:
+            List of JobLog objects for failed jobs
+        """
+        # Fetch all jobs across all pages (GitHub paginates at 30 per page by default)
+        all_jobs = await self._fetch_all_jobs(client)
+
+        # First pass: collect metadata for every failed job
+        pending: list[tuple[int, JobLog]] = []
+        for job in all_jobs:
+            conclusion = job.get("conclusion")
+            if conclusion in ("failure", "cancelled"):
+                # Extract job metadata
+                job_id = job["id"]
+                job_name = job["name"]
+                started_at = job.get("started_at")
+                completed_at = job.get("completed_at")
+
+                # Calculate duration
+                duration_seconds = None
+                if started_at and completed_at:
+                    start = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+                    end = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
+                    duration_seconds = int((end - start).total_seconds())
+
+                # Find failed step
+                failed_step_name = "Unknown Step"
+                exit_code = None
+                for step in job.get("steps", []):
+                    if step.get("conclusion") in ("failure", "cancelled"):
+                        failed_step_name = step.get("name", "Unknown Step")
+                        # Exit code might not always be available
+                        if "number" in step:
+                            exit_code = 1  # Default to 1 for failed steps
+                        break
+
+                pending.append(
+                    (
+                        job_id,
                         JobLog(
                             job_name=job_name,
                             step_name=failed_step_name,
                             conclusion=conclusion,
-                            raw_logs=raw_logs,
+                            raw_logs="",
                             exit_code=exit_code,
                             duration_seconds=duration_seconds,
-                        )
+                        ),
                     )
+                )
 
-            return failed_jobs
+        # Second pass: download all logs concurrently (bounded), keeping job order
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOG_FETCHES)
+
+        async def fetch_logs(job_id: int) -> str:
+            async with semaphore:
+                return await self._fetch_job_logs(client, job_id)
+
+        all_logs = await asyncio.gather(*(fetch_logs(job_id) for job_id, _ in pending))
+
+        return [
+            replace(job_log, raw_logs=raw_logs)
+            for (_, job_log), raw_logs in zip(pending, all_logs, strict=True)
+        ]
 
     async def _fetch_all_jobs(self, client: httpx.AsyncClient) -> list[dict[str, Any]]:
         """Fetch all jobs for the run, handling pagination.
 
         GitHub API paginates at 30 jobs per page by default. This method
         fetches all pages to ensure we don't miss failures in large matrix builds.
+        The first page's total_count tells how many pages remain, so those are
+        requested concurrently instead of one after another.
 
         Args:
             client: HTTP client to use
@@ -111,35 +195,46 @@ class LogFetcher:
         Returns:
             List of all job objects from GitHub API
         """
-        all_jobs = []
-        page = 1
         per_page = 100  # Request max per page to minimize API calls
 
-        while True:
-            jobs_url = (
-                f"{self.base_url}/repos/{self.repo}/actions/runs/{self.run_id}/jobs"
-                f"?page={page}&per_page={per_page}"
-            )
-            response = await client.get(jobs_url, headers=self.headers)
-            response.raise_for_status()
-            jobs_data = response.json()
+        jobs_data = await self._fetch_jobs_page(client, 1, per_page)
+        all_jobs: list[dict[str, Any]] = jobs_data.get("jobs", [])
 
-            jobs = jobs_data.get("jobs", [])
-            if not jobs:
-                # No more jobs, we've reached the end
-                break
+        # Check if there are more pages
+        total_count = jobs_data.get("total_count", 0)
+        if not all_jobs or len(all_jobs) >= total_count:
+            return all_jobs
 
-            all_jobs.extend(jobs)
+        last_page = -(-total_count // per_page)
+        pages = await asyncio.gather(
+            *(self._fetch_jobs_page(client, page, per_page) for page in range(2, last_page + 1))
+        )
+        for page_data in pages:
+            all_jobs.extend(page_data.get("jobs", []))
 
-            # Check if there are more pages
-            total_count = jobs_data.get("total_count", 0)
-            if len(all_jobs) >= total_count:
-                # We've fetched all jobs
-                break
+        return all_jobs
 
-            page += 1
+    async def _fetch_jobs_page(
+        self, client: httpx.AsyncClient, page: int, per_page: int
+    ) -> dict[str, Any]:
+        """Fetch one page of the run's jobs listing.
 
-        return all_jobs
+        Args:
+            client: HTTP client to use
+            page: 1-based page number
+            per_page: Jobs per page
+
+        Returns:
+            Decoded page, with "jobs" and "total_count"
+        """
+        jobs_url = (
+            f"{self.base_url}/repos/{self.repo}/actions/runs/{self.run_id}/jobs"
+            f"?page={page}&per_page={per_page}"
+        )
+        response = await client.get(jobs_url, headers=self.headers)
+        response.raise_for_status()
+        jobs_data: dict[str, Any] = _loads(response.content)
+        return jobs_data
 
     async def _fetch_job_logs(self, client: httpx.AsyncClient, job_id: int) -> str:
         """Fetch logs for a specific job.
@@ -149,9 +244,44 @@ class LogFetcher:
             job_id: GitHub job ID
 
         Returns:
-            Raw log content as string
+            Raw log content as string (with tail_bytes, its last tail_bytes
+            bytes, cut to whole lines)
         """
         logs_url = f"{self.base_url}/repos/{self.repo}/actions/jobs/{job_id}/logs"
-        response = await client.get(logs_url, headers=self.headers)
-        response.raise_for_status()
-        return response.text
+        headers = self.headers
+        if self.tail_bytes is not None:
+            # Honored by the blob storage the endpoint redirects to; servers
+            # ignoring it answer 200 with the whole log
+            headers = {**headers, "Range": f"bytes=-{self.tail_bytes}"}
+
+        async with client.stream("GET", logs_url, headers=headers) as response:
+            if response.status_code == 416:
+                # Range not satisfiable: the log is empty
+                return ""
+            response.raise_for_status()
+
+            if self.tail_bytes is None:
+                # Decoded chunk by chunk, so the raw bytes of a multi-MB log are
+                # never held alongside the decoded text
+                return "".join([chunk async for chunk in response.aiter_text()])
+
+            # Servers ignoring the Range header send the whole log; only about
+            # its last tail_bytes bytes are kept while it streams in
+            chunks: deque[bytes] = deque()
+            size = 0
+            dropped = False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                while size - len(chunks[0]) >= self.tail_bytes:
+                    size -= len(chunks.popleft())
+                    dropped = True
+            text = b"".join(chunks).decode(response.encoding or "utf-8", "replace")
+
+        if dropped or (
+            response.status_code == 206
+            and not response.headers.get("content-range", "").startswith("bytes 0-")
+        ):
+            # The kept part starts inside a line (maybe inside a character): drop it
+            text = text.partition("\n")[2]
+        return text
@@ -2,17 +2,24 @@
 
 import asyncio
 import sys
+import traceback
+from importlib.util import find_spec
 
+import httpx
 from pydantic import ValidationError
 
 from actions_ai_advisor.config import Config
 from actions_ai_advisor.file_parser import parse_affected_files
 from actions_ai_advisor.formatter import format_analysis, write_job_summary
 from actions_ai_advisor.llm_client import LLMClient
-from actions_ai_advisor.log_fetcher import LogFetcher
+from actions_ai_advisor.log_fetcher import JobLog, LogFetcher
 from actions_ai_advisor.preprocessor import preprocess_logs
 from actions_ai_advisor.tokens import TokenCounter
 
+# HTTP/2 needs the optional h2 package (pip install "actions-ai-advisor[http2]");
+# without it the shared client speaks HTTP/1.1
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
 
 async def analyze_failure() -> int:
     """Analyze failed GitHub Actions jobs.
@@ -33,94 +40,159 @@ async def analyze_failure() -> int:
     print(f"🤖 Provider: {config.provider} ({config.model})")
 
     try:
-        # Fetch failed job logs
-        print("\n📥 Fetching failed job logs...")
-        fetcher = LogFetcher(
-            github_token=config.github_token,
-            repo=config.github_repository,
-            run_id=config.github_run_id,
-        )
-        failed_jobs = await fetcher.fetch_failed_jobs()
-
-        if not failed_jobs:
-            print("✅ No failed jobs found!")
+        # One connection pool for the whole run: the job listing, every log
+        # download and every LLM call reuse kept-alive connections instead of
+        # paying a TCP + TLS handshake per request. Over HTTP/2, concurrent log
+        # downloads are multiplexed on a single connection per host.
+        async with httpx.AsyncClient(
+            timeout=60.0,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        ) as http_client:
+            # Fetch failed job logs
+            print("\n📥 Fetching failed job logs...")
+            fetcher = LogFetcher(
+                github_token=config.github_token,
+                repo=config.github_repository,
+                run_id=config.github_run_id,
+                client=http_client,
+            )
+            failed_jobs = await fetcher.fetch_failed_jobs()
+
+            if not failed_jobs:
+                print("✅ No failed jobs found!")
+                return 0
+
+            print(f"Found {len(failed_jobs)} failed job(s)")
+
+            # Initialize LLM client and token counter
+            llm_client = LLMClient(
+                provider=config.provider,
+                api_key=config.api_key,
+                model=config.model,
+                base_url=config.base_url,
+                client=http_client,
+            )
+            token_counter = TokenCounter(config.model)
+
+            # Preprocess every log first, so their tokens are counted in one batch
+            preprocessed_logs = [preprocess_logs(job_log.raw_logs) for job_log in failed_jobs]
+            token_counts = token_counter.count_many(preprocessed_logs)
+
+            # Analyze jobs concurrently, at most max_concurrency LLM calls at a time
+            semaphore = asyncio.Semaphore(config.max_concurrency)
+            summaries = await asyncio.gather(
+                *(
+                    _analyze_job(
+                        f"[{i}/{len(failed_jobs)}]",
+                        job_log,
+                        preprocessed,
+                        token_count,
+                        config,
+                        llm_client,
+                        semaphore,
+                    )
+                    for i, (job_log, preprocessed, token_count) in enumerate(
+                        zip(failed_jobs, preprocessed_logs, token_counts, strict=True), 1
+                    )
+                )
+            )
+
+            # Written in job order, whatever order the analyses finished in
+            for i, markdown in enumerate(summaries, 1):
+                if markdown is None:
+                    continue
+                try:
+                    write_job_summary(markdown)
+                except Exception as e:
+                    # Continue with other jobs even if one summary can't be written
+                    print(
+                        f"  ⚠️  [{i}/{len(failed_jobs)}] Writing job summary failed: {e}",
+                        file=sys.stderr,
+                    )
+
+            print("\n✅ Analysis complete!")
             return 0
 
-        print(f"Found {len(failed_jobs)} failed job(s)")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return 1
 
-        # Initialize LLM client and token counter
-        llm_client = LLMClient(
-            provider=config.provider,
-            api_key=config.api_key,
-            model=config.model,
-            base_url=config.base_url,
-        )
-        token_counter = TokenCounter(config.model)
-
-        # Process each failed job
-        for i, job_log in enumerate(failed_jobs, 1):
-            print(f"\n[{i}/{len(failed_jobs)}] Analyzing: {job_log.job_name} → {job_log.step_name}")
-
-            # Preprocess logs
-            preprocessed = preprocess_logs(job_log.raw_logs)
-            print(f"  📉 Preprocessed logs: {len(job_log.raw_logs)} → {len(preprocessed)} chars")
-
-            # Parse affected files from logs (gracefully handle failures)
-            affected_files = []
-            try:
-                affected_files = parse_affected_files(job_log.raw_logs)
-                if affected_files:
-                    print(f"  📁 Found {len(affected_files)} affected file(s)")
-            except Exception as e:
-                # Don't fail the entire analysis if file parsing fails
-                print(f"  ⚠️  File parsing failed: {e}", file=sys.stderr)
-
-            # Count tokens
-            token_count = token_counter.count_tokens(preprocessed)
-            print(f"  🔢 Estimated input tokens: {token_count}")
-
-            # Analyze with LLM
-            print("  🤖 Sending to LLM for analysis...")
-            try:
-                result = await llm_client.analyze(job_log, preprocessed)
-                print(f"  ✅ Analysis complete ({result.output_tokens} output tokens)")
-
-                # Estimate cost
-                estimated_cost = TokenCounter.estimate_cost(
-                    input_tokens=result.input_tokens,
-                    output_tokens=result.output_tokens,
-                    provider=config.provider,
-                    model=config.model,
-                )
 
-                # Format and write output
-                markdown = format_analysis(
-                    job_log,
-                    result,
-                    estimated_cost,
-                    affected_files=affected_files,
-                    repo_owner=config.repo_owner,
-                    repo_name=config.repo_name,
-                    commit_sha=config.github_sha,
-                )
-                write_job_summary(markdown)
+async def _analyze_job(
+    label: str,
+    job_log: JobLog,
+    preprocessed: str,
+    token_count: int,
+    config: Config,
+    llm_client: LLMClient,
+    semaphore: asyncio.Semaphore,
+) -> str | None:
+    """Analyze one failed job and format its Job Summary section.
+
+    Args:
+        label: Progress prefix for console output (e.g. "[2/5]")
+        job_log: Failed job with its logs
+        preprocessed: Preprocessed logs of the job
+        token_count: Estimated input tokens of the preprocessed logs
+        config: Run configuration
+        llm_client: LLM client to analyze with
+        semaphore: Bounds the number of LLM calls in flight
 
-                if estimated_cost is not None:
-                    print(f"  💰 Estimated cost: ${estimated_cost:.4f}")
+    Returns:
+        Markdown for the Job Summary, or None if the LLM analysis failed
+    """
+    print(f"\n{label} Analyzing: {job_log.job_name} → {job_log.step_name}")
+    print(f"  📉 Preprocessed logs: {len(job_log.raw_logs)} → {len(preprocessed)} chars")
 
-            except Exception as e:
-                print(f"  ⚠️  LLM analysis failed: {e}", file=sys.stderr)
-                # Continue with other jobs even if one fails
-                continue
+    # Parse affected files from logs (gracefully handle failures)
+    affected_files = []
+    try:
+        affected_files = parse_affected_files(job_log.raw_logs)
+        if affected_files:
+            print(f"  📁 Found {len(affected_files)} affected file(s)")
+    except Exception as e:
+        # Don't fail the entire analysis if file parsing fails
+        print(f"  ⚠️  File parsing failed: {e}", file=sys.stderr)
 
-        print("\n✅ Analysis complete!")
-        return 0
+    print(f"  🔢 Estimated input tokens: {token_count}")
+
+    # Analyze with LLM
+    print("  🤖 Sending to LLM for analysis...")
+    try:
+        async with semaphore:
+            result = await llm_client.analyze(job_log, preprocessed)
+        # Other jobs' output may have been printed meanwhile, hence the label
+        print(f"  ✅ {label} Analysis complete ({result.output_tokens} output tokens)")
+
+        # Estimate cost
+        estimated_cost = TokenCounter.estimate_cost(
+            input_tokens=result.input_tokens,
+            output_tokens=result.output_tokens,
+            provider=config.provider,
+            model=config.model,
+            cached_input_tokens=result.cached_input_tokens,
+        )
+        if estimated_cost is not None:
+            print(f"  💰 {label} Estimated cost: ${estimated_cost:.4f}")
+
+        # Format output
+        return format_analysis(
+            job_log,
+            result,
+            estimated_cost,
+            affected_files=affected_files,
+            repo_owner=config.repo_owner,
+            repo_name=config.repo_name,
+            commit_sha=config.github_sha,
+        )
 
     except Exception as e:
-        print(f"\n❌ Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
-        return 1
+        print(f"  ⚠️  {label} LLM analysis failed: {e}", file=sys.stderr)
+        # Continue with other jobs even if one fails
+        return None
 
 
 def main() -> None:
@@ -1,6 +1,23 @@
 """Log preprocessing module to reduce tokens and extract relevant information."""
 
 import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+# These stay on the stdlib engine even when the re2 extra is installed: none of
+# them can backtrack beyond a line, and re2's sub() builds its result in Python,
+# which on long logs with a match per line is >10x slower than re.sub().
+
+# ANSI escape sequences (colors, cursor movement)
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
+
+# ISO 8601 timestamp prefixes: 2024-01-01T10:00:00.123456Z
+_TS_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s*", re.MULTILINE)
+
+# GitHub Actions metadata markers, matched at the start of a line
+_META_RE = re.compile(
+    r"##\[(?:group|endgroup|command|debug)\]|::(?:set-output|debug|notice|warning)"
+)
 
 
 def preprocess_logs(raw_logs: str) -> str:
@@ -15,25 +32,19 @@ def preprocess_logs(raw_logs: str) -> str:
     # Step 1: Remove ANSI escape codes
     text = _remove_ansi_codes(raw_logs)
 
-    # Step 2: Remove timestamp prefixes
+    # Step 2: Remove timestamp prefixes (on the whole text: a prefix's trailing
+    # whitespace may run over the newline of an otherwise empty line)
     text = _remove_timestamps(text)
 
-    # Step 3: Split into lines for further processing
-    lines = text.split("\n")
-
-    # Step 4: Remove GitHub Actions metadata lines
-    lines = _remove_github_metadata(lines)
-
-    # Step 5: Collapse repeated lines
-    lines = _collapse_repeated_lines(lines)
-
-    # Step 6: Remove excessive empty lines
-    lines = _remove_excessive_empty_lines(lines)
+    # Steps 3-6: split into lines, drop GitHub Actions metadata, collapse
+    # repeated lines and excessive empty lines. The stages are generators, so
+    # each line flows through all of them without intermediate lists.
+    lines = _remove_excessive_empty_lines(
+        _collapse_repeated_lines(_remove_github_metadata(text.split("\n")))
+    )
 
     # Step 7: Keep last N lines (focus on the failure)
-    lines = lines[-150:]
-
-    return "\n".join(lines)
+    return "\n".join(deque(lines, maxlen=150))
 
 
 def _remove_ansi_codes(text: str) -> str:
@@ -45,8 +56,10 @@ def _remove_ansi_codes(text: str) -> str:
     Returns:
         Text without ANSI codes
     """
-    ansi_escape = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
-    return ansi_escape.sub("", text)
+    # Plain logs (no ESC at all) skip the regex scan for a fast substring check
+    if "\x1b" not in text:
+        return text
+    return _ANSI_RE.sub("", text)
 
 
 def _remove_timestamps(text: str) -> str:
@@ -58,56 +71,36 @@ def _remove_timestamps(text: str) -> str:
     Returns:
         Text without timestamps
     """
-    # Match ISO 8601 timestamps: 2024-01-01T10:00:00.123456Z
-    timestamp_pattern = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z\s*", re.MULTILINE)
-    return timestamp_pattern.sub("", text)
+    return _TS_RE.sub("", text)
 
 
-def _remove_github_metadata(lines: list[str]) -> list[str]:
+def _remove_github_metadata(lines: Iterable[str]) -> Iterator[str]:
     """Remove GitHub Actions metadata lines.
 
     Args:
-        lines: List of log lines
+        lines: Log lines
 
     Returns:
-        Filtered list without metadata
+        Iterator over the lines that aren't metadata
     """
-    metadata_patterns = [
-        r"^##\[group\]",
-        r"^##\[endgroup\]",
-        r"^##\[command\]",
-        r"^##\[debug\]",
-        r"::set-output",
-        r"::debug",
-        r"::notice",
-        r"::warning",
-    ]
-
-    filtered_lines = []
-    for line in lines:
-        is_metadata = any(re.match(pattern, line) for pattern in metadata_patterns)
-        if not is_metadata:
-            filtered_lines.append(line)
-
-    return filtered_lines
+    is_metadata = _META_RE.match
+    return (line for line in lines if not is_metadata(line))
 
 
-def _collapse_repeated_lines(lines: list[str]) -> list[str]:
+def _collapse_repeated_lines(lines: Iterable[str]) -> Iterator[str]:
     """Collapse consecutive repeated lines.
 
     If the same line appears 3+ times consecutively, replace with
     single instance + count.
 
     Args:
-        lines: List of log lines
+        lines: Log lines
 
-    Returns:
-        List with repeated lines collapsed
+    Yields:
+        Lines with repeated lines collapsed
     """
-    if not lines:
-        return lines
-
-    collapsed = []
+    # Hand-rolled rather than itertools.groupby: almost every log line differs
+    # from the previous one, and a grouper object per line costs twice this loop
     prev_line = None
     repeat_count = 0
 
@@ -118,11 +111,11 @@ def _collapse_repeated_lines(lines: list[str]) -> list[str]:
             # Output previous line if it had repeats
             if prev_line is not None:
                 if repeat_count >= 3:
-                    collapsed.append(f"{prev_line} (repeated {repeat_count} times)")
+                    yield f"{prev_line} (repeated {repeat_count} times)"
                 else:
                     # Add each individual line if less than 3 repeats
                     for _ in range(repeat_count):
-                        collapsed.append(prev_line)
+                        yield prev_line
 
             prev_line = line
             repeat_count = 1
@@ -130,33 +123,28 @@ def _collapse_repeated_lines(lines: list[str]) -> list[str]:
     # Handle last line
     if prev_line is not None:
         if repeat_count >= 3:
-            collapsed.append(f"{prev_line} (repeated {repeat_count} times)")
+            yield f"{prev_line} (repeated {repeat_count} times)"
         else:
             for _ in range(repeat_count):
-                collapsed.append(prev_line)
+                yield prev_line
 
-    return collapsed
 
-
-def _remove_excessive_empty_lines(lines: list[str]) -> list[str]:
+def _remove_excessive_empty_lines(lines: Iterable[str]) -> Iterator[str]:
     """Remove more than 2 consecutive empty lines.
 
     Args:
-        lines: List of log lines
+        lines: Log lines
 
-    Returns:
-        List with excessive empty lines removed
+    Yields:
+        Lines with excessive empty lines removed
     """
-    filtered = []
     empty_count = 0
 
     for line in lines:
         if line.strip() == "":
             empty_count += 1
             if empty_count <= 2:
-                filtered.append(line)
+                yield line
         else:
             empty_count = 0
-            filtered.append(line)
-
-    return filtered
+            yield line
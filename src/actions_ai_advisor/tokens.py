@@ -1,5 +1,8 @@
 """Token counting and cost estimation module."""
 
+import os
+from functools import lru_cache
+
 import tiktoken
 
 # Pricing per 1M tokens (input, output)
@@ -30,6 +33,54 @@ PRICING: dict[str, dict[str, tuple[float, float]]] = {
 }
 
 
+# PRICING keyed by (provider, model), so a price is found with one lookup
+_PRICING_BY_MODEL: dict[tuple[str, str], tuple[float, float]] = {
+    (provider, model): price
+    for provider, models in PRICING.items()
+    for model, price in models.items()
+}
+
+# Price of a cached input token relative to a regular one, per provider
+# (providers not listed are estimated without a discount)
+CACHED_INPUT_PRICE_RATIO: dict[str, float] = {
+    "openai": 0.5,
+    "anthropic": 0.1,
+}
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Return the tiktoken encoding for a model, shared by all counters.
+
+    Args:
+        model: Model name
+
+    Returns:
+        The model's encoding, or cl100k_base for unknown models
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fall back to cl100k_base for unknown models
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=256)
+def _count_tokens(model: str, text: str) -> int:
+    """Count the tokens of a text for a model, remembering recent results.
+
+    Args:
+        model: Model name
+        text: Text to count tokens for
+
+    Returns:
+        Number of tokens
+    """
+    # encode_ordinary: log text is never meant to carry special tokens, and
+    # encode() would raise on a log that happens to print "<|endoftext|>"
+    return len(_get_encoding(model).encode_ordinary(text))
+
+
 class TokenCounter:
     """Count tokens and estimate costs for LLM API calls."""
 
@@ -40,11 +91,7 @@ class TokenCounter:
             model: Model name to use for token counting
         """
         self.model = model
-        try:
-            self.encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # Fall back to cl100k_base for unknown models
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.encoding = _get_encoding(model)
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in text.
@@ -55,11 +102,30 @@ class TokenCounter:
         Returns:
             Number of tokens
         """
-        return len(self.encoding.encode(text))
+        return _count_tokens(self.model, text)
+
+    def count_many(self, texts: list[str]) -> list[int]:
+        """Count tokens in several texts at once.
+
+        The texts are encoded in one call that runs on tiktoken's native
+        threads, outside the GIL.
+
+        Args:
+            texts: Texts to count tokens for
+
+        Returns:
+            Number of tokens of each text, in the same order
+        """
+        encoded = self.encoding.encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)
+        return [len(ids) for ids in encoded]
 
     @staticmethod
     def estimate_cost(
-        input_tokens: int, output_tokens: int, provider: str, model: str
+        input_tokens: int,
+        output_tokens: int,
+        provider: str,
+        model: str,
+        cached_input_tokens: int = 0,
     ) -> float | None:
         """Estimate cost for token usage.
 
@@ -68,24 +134,25 @@ class TokenCounter:
             output_tokens: Number of output tokens
             provider: LLM provider name
             model: Model name
+            cached_input_tokens: Part of input_tokens read from the prompt cache,
+                billed at a discount
 
         Returns:
             Estimated cost in USD, or None if pricing not available
         """
-        if provider not in PRICING:
-            return None
-
         # Normalize model name: convert dots to hyphens for consistent lookup
         # Example: anthropic/claude-3.5-haiku → anthropic/claude-3-5-haiku
         normalized_model = model.replace(".", "-")
 
         # Try normalized model name first, then fall back to original
-        model_pricing = PRICING[provider].get(normalized_model) or PRICING[provider].get(
-            model
+        model_pricing = _PRICING_BY_MODEL.get((provider, normalized_model)) or (
+            _PRICING_BY_MODEL.get((provider, model))
         )
         if not model_pricing:
             return None
 
         input_price, output_price = model_pricing
-        cost = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+        cached = min(cached_input_tokens, input_tokens)
+        billed_input = input_tokens - cached + cached * CACHED_INPUT_PRICE_RATIO.get(provider, 1.0)
+        cost = (billed_input * input_price + output_tokens * output_price) / 1_000_000
         return cost
@@ -13,6 +13,7 @@ def test_config_with_defaults(sample_github_env: dict[str, str]) -> None:
     assert config.model == "gpt-4o-mini"
     assert config.github_token == "ghp_test_token_12345"
     assert config.api_key == "sk-test-key-67890"
+    assert config.max_concurrency == 4
 
 
 def test_config_repo_properties(sample_github_env: dict[str, str]) -> None:
@@ -1,12 +1,35 @@
 """Tests for file parser module."""
 
+import re
+from collections.abc import Iterator
+
+import pytest
+
+from actions_ai_advisor import file_parser
 from actions_ai_advisor.file_parser import (
     AffectedFile,
     format_github_link,
+    format_github_links,
     parse_affected_files,
+    parse_affected_files_from_file,
+    parse_affected_files_many,
+    parse_affected_files_parallel,
 )
 
 
+@pytest.fixture(autouse=True, params=["re", "re2"])
+def regex_engine(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Run every test with the stdlib engine and, when installed, with RE2."""
+    engine = re if request.param == "re" else pytest.importorskip("re2")
+    monkeypatch.setattr(file_parser, "_linear_re", engine)
+    # Scan plans are compiled for the engine in use when they are first built
+    file_parser._scan_plan.cache_clear()
+    file_parser._bytes_scan_plan.cache_clear()
+    yield request.param
+    file_parser._scan_plan.cache_clear()
+    file_parser._bytes_scan_plan.cache_clear()
+
+
 def test_parse_python_traceback():
     """Test parsing Python traceback with file and line number."""
     log = """
@@ -104,6 +127,103 @@ src/types.py:1: error
     assert len(files) == 2
 
 
+def test_parse_file_mention_with_line_number():
+    """Test that a keyword mention followed by :line yields the mention and the location."""
+    log = """
+ImportError while importing test module from tests/test_app.py:10
+"""
+    files = parse_affected_files(log)
+
+    assert files == [
+        AffectedFile(file_path="tests/test_app.py"),
+        AffectedFile(file_path="tests/test_app.py", line_start=10),
+    ]
+
+
+def test_parse_keeps_overlapping_matches():
+    """Test that a mention of a shorter extension doesn't hide the full location."""
+    for log, path, line in [
+        ("ERROR in src/components/App.tsx:12:5", "src/components/App.tsx", 12),
+        ("Error: from src/App.jsx:10:5 failed", "src/App.jsx", 10),
+    ]:
+        files = parse_affected_files(log)
+
+        assert AffectedFile(file_path=path, line_start=line) in files
+
+
+def test_parse_non_ascii_paths():
+    """Test that non-ASCII directory and file names stay part of the path."""
+    assert parse_affected_files("src/données/app.py:3: error") == [
+        AffectedFile(file_path="src/données/app.py", line_start=3)
+    ]
+    assert parse_affected_files("tests/тест_app.py:12") == [
+        AffectedFile(file_path="tests/тест_app.py", line_start=12)
+    ]
+
+
+def test_parse_whole_log_matches_line_by_line():
+    """Test that scanning the whole log finds what scanning each line finds."""
+    lines = [
+        "ERROR in src/components/App.tsx:12:5",
+        "    at src/index.js:3:1",
+        'File "src/main.py", line 42, in main from src/util.py:7',
+        "Program.cs(10,31): error in src/Program.cs",
+    ]
+    by_line = {file for line in lines for file in parse_affected_files(line)}
+
+    assert set(parse_affected_files("\n".join(lines))) == by_line
+    assert set(parse_affected_files("\r\n".join(lines))) == by_line
+
+
+def test_parse_without_colons_or_quotes():
+    """Test that logs without ':' or '"' can still mention files."""
+    files = parse_affected_files("Can't resolve './src/missing' while checking src/app.js")
+
+    paths = {f.file_path for f in files}
+    assert "src/missing" in paths
+    assert "src/app.js" in paths
+
+
+def test_parse_no_file_mentions():
+    """Test that logs with no file-like content return no files."""
+    assert parse_affected_files("Job failed\nProcess completed with exit code 1\n") == []
+
+
+def test_file_patterns_metadata_matches_patterns():
+    """Test that each pattern's declared literals and line group are accurate."""
+    from actions_ai_advisor.file_parser import _file_patterns
+
+    samples = [
+        'File "src/main.py", line 42, in main',
+        'mypy: "src/types.py" shadows library module',
+        "    at /home/runner/work/app/app/src/index.tsx:10:5",
+        "Module not found: Error: Can't resolve './components/Header'",
+        "PHP Fatal error: Uncaught Error in /app/src/index.php on line 4",
+        "Dockerfile:4",
+        "make: *** [Makefile:12: build] Error 1",
+        "ImportError while importing test module from tests/test_app.py:10",
+        "Program.cs(10,31): error CS0103",
+        "src/lib.cpp:7:3: error: expected ';'",
+    ]
+    for entry in _file_patterns():
+        assert "file" in entry.pattern.groupindex
+        assert entry.has_line_group == ("line" in entry.pattern.groupindex)
+        assert entry.literals
+        # Prefiltering relies on every match containing one of the literals
+        for sample in samples:
+            for match in entry.pattern.finditer(sample):
+                assert any(literal in match.group(0) for literal in entry.literals)
+
+
+def test_affected_file_identity_ignores_description():
+    """Test that description does not affect equality or hashing."""
+    first = AffectedFile(file_path="src/main.py", line_start=42, description="error")
+    second = AffectedFile(file_path="src/main.py", line_start=42)
+
+    assert first == second
+    assert len({first, second}) == 1
+
+
 def test_format_github_link_with_line():
     """Test GitHub link formatting with line number."""
     file = AffectedFile(file_path="src/main.py", line_start=42)
@@ -134,6 +254,19 @@ def test_format_github_link_without_line():
     assert link == "[`src/main.py`](https://github.com/user/repo/blob/abc123/src/main.py)"
 
 
+def test_format_github_links_matches_single_links():
+    """Test that batch link formatting joins the per-file links in order."""
+    files = [
+        AffectedFile(file_path="src/main.py", line_start=42),
+        AffectedFile(file_path="main.py", line_start=7),
+        AffectedFile(file_path="src/util.py", line_start=10, line_end=15),
+    ]
+
+    links = format_github_links(files, "user", "repo", "abc123", sep="\n- ")
+
+    assert links == "\n- ".join(format_github_link(f, "user", "repo", "abc123") for f in files)
+
+
 def test_parse_empty_log():
     """Test parsing empty log returns empty list."""
     files = parse_affected_files("")
@@ -387,3 +520,70 @@ def test_parse_rust_with_ansi_codes_and_timestamps():
     )
     # Verify it's not just src/lib.rs
     assert not any(f.file_path == "src/lib.rs" for f in files)
+
+
+def test_parse_affected_files_from_file(tmp_path):
+    """Test that parsing a log file matches parsing its content."""
+    log = """
+Compiling rust-app v0.1.0 (/home/runner/work/repo/repo/rust-app)
+thread 'tests::it_works' panicked at src/lib.rs:11:9:
+Traceback (most recent call last):
+  File "/home/runner/work/repo/repo/src/main.py", line 42, in main
+src/utils.js:10:5: error
+"""
+    log_path = tmp_path / "job.log"
+    log_path.write_text(log)
+
+    files = parse_affected_files_from_file(log_path)
+
+    assert files == parse_affected_files(log)
+    assert any(f.file_path == "rust-app/src/lib.rs" and f.line_start == 11 for f in files)
+
+
+def test_parse_affected_files_from_file_non_ascii_paths(tmp_path):
+    """Test that non-ASCII paths in a log file parse as they do from a str."""
+    log = "src/données/app.py:3: error\ntests/тест_app.py:12\nin src/ünï.py\n"
+    log_path = tmp_path / "job.log"
+    log_path.write_text(log, encoding="utf-8")
+
+    files = parse_affected_files_from_file(log_path)
+
+    assert files == parse_affected_files(log)
+    assert AffectedFile(file_path="src/données/app.py", line_start=3) in files
+    assert AffectedFile(file_path="tests/тест_app.py", line_start=12) in files
+
+
+def test_parse_affected_files_from_empty_file(tmp_path):
+    """Test that an empty log file yields no files."""
+    log_path = tmp_path / "empty.log"
+    log_path.write_bytes(b"")
+
+    assert parse_affected_files_from_file(log_path) == []
+
+
+def test_parse_affected_files_parallel_matches_sequential():
+    """Test that parallel parsing of a large log matches sequential parsing."""
+    block = """
+Compiling rust-app v0.1.0 (/home/runner/work/repo/repo/rust-app)
+thread 'tests::it_works' panicked at src/lib.rs:11:9:
+  File "/home/runner/work/repo/repo/src/main.py", line 42, in main
+src/utils.js:10:5: error
+"""
+    extra = "".join(f"tests/test_{i}.py:{i}: AssertionError\n" for i in range(200))
+    log = block * 5000 + extra
+
+    assert len(log) > 1_000_000
+    assert parse_affected_files_parallel(log, workers=2) == parse_affected_files(log)
+
+
+def test_parse_affected_files_many_matches_per_log_parsing():
+    """Test that batch parsing returns each log's files, in order."""
+    large_a = 'File "src/a.py", line 1, in f\n' * 10_000
+    large_b = "src/b.js:2:3: error\n" * 15_000
+    small = "Dockerfile:4 unknown instruction\n"
+    logs = [large_a, small, large_b, ""]
+
+    assert len(large_a) >= 256_000 and len(large_b) >= 256_000
+    assert parse_affected_files_many(logs, workers=2) == [
+        parse_affected_files(log) for log in logs
+    ]
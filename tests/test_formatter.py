@@ -109,6 +109,27 @@ def test_format_analysis_without_cost():
     assert "**Cost:** N/A" in markdown
 
 
+def test_format_analysis_cached_tokens():
+    """Test that prompt-cache hits are shown next to the input tokens."""
+    job_log = JobLog(
+        job_name="lint",
+        step_name="Check code",
+        conclusion="failure",
+        raw_logs="lint logs",
+    )
+    result = AnalysisResult(
+        analysis="Linting errors detected",
+        input_tokens=1500,
+        output_tokens=250,
+        model_used="gpt-4o-mini",
+        cached_input_tokens=1024,
+    )
+
+    markdown = format_analysis(job_log, result, estimated_cost=None)
+
+    assert "**Tokens:** 1,500 in (1,024 cached) + 250 out" in markdown
+
+
 def test_format_analysis_no_exit_code():
     """Test analysis formatting when exit code is None."""
     job_log = JobLog(
@@ -155,6 +176,20 @@ def test_write_job_summary_to_file(monkeypatch):
         os.unlink(temp_file)
 
 
+def test_write_job_summary_completes_short_writes(tmp_path, monkeypatch):
+    """Test that the whole summary is written even when os.write writes less."""
+    summary_file = tmp_path / "summary.md"
+    monkeypatch.setenv("GITHUB_STEP_SUMMARY", str(summary_file))
+
+    real_write = os.write
+    monkeypatch.setattr(os, "write", lambda fd, data: real_write(fd, data[:7]))
+
+    content = "# Test Summary\nThis is a test with ünïcode"
+    write_job_summary(content)
+
+    assert summary_file.read_text(encoding="utf-8") == content + "\n\n"
+
+
 def test_write_job_summary_no_env_var(capsys, monkeypatch):
     """Test writing job summary when env var not set."""
     monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
@@ -1,5 +1,7 @@
 """Tests for LLM client module."""
 
+import json
+
 import httpx
 import pytest
 
@@ -21,8 +23,32 @@ def sample_job_log() -> JobLog:
 
 
 @pytest.mark.asyncio
-async def test_analyze_with_openai(respx_mock, sample_job_log):
-    """Test analysis with OpenAI provider."""
+@pytest.mark.parametrize(
+    ("provider", "model", "base_url", "url"),
+    [
+        ("openai", "gpt-4o-mini", None, "https://api.openai.com/v1/chat/completions"),
+        (
+            "anthropic",
+            "claude-3-5-haiku-latest",
+            None,
+            "https://api.anthropic.com/v1/chat/completions",
+        ),
+        (
+            "openrouter",
+            "anthropic/claude-3.5-haiku",
+            None,
+            "https://openrouter.ai/api/v1/chat/completions",
+        ),
+        (
+            "selfhosted",
+            "custom-model",
+            "https://custom.llm.com/v1",
+            "https://custom.llm.com/v1/chat/completions",
+        ),
+    ],
+)
+async def test_analyze_with_provider(respx_mock, sample_job_log, provider, model, base_url, url):
+    """Test analysis against each provider's chat completions endpoint."""
     mock_response = {
         "choices": [
             {
@@ -37,94 +63,87 @@ async def test_analyze_with_openai(respx_mock, sample_job_log):
         "usage": {"prompt_tokens": 100, "completion_tokens": 50},
     }
 
-    respx_mock.post("https://api.openai.com/v1/chat/completions").mock(
-        return_value=httpx.Response(200, json=mock_response)
-    )
+    respx_mock.post(url).mock(return_value=httpx.Response(200, json=mock_response))
 
-    client = LLMClient(
-        provider="openai", api_key="test-key", model="gpt-4o-mini"
-    )
+    client = LLMClient(provider=provider, api_key="test-key", model=model, base_url=base_url)
     result = await client.analyze(sample_job_log, "preprocessed logs")
 
     assert isinstance(result, AnalysisResult)
     assert "Root Cause" in result.analysis
     assert result.input_tokens == 100
     assert result.output_tokens == 50
-    assert result.model_used == "gpt-4o-mini"
+    assert result.model_used == model
 
 
 @pytest.mark.asyncio
-async def test_analyze_with_anthropic(respx_mock, sample_job_log):
-    """Test analysis with Anthropic provider."""
+async def test_analyze_reports_cached_tokens(respx_mock, sample_job_log):
+    """Test that prompt-cache hits from the usage block are kept."""
     mock_response = {
-        "choices": [
-            {"message": {"content": "## Root Cause\nDatabase connection failed"}}
-        ],
-        "usage": {"prompt_tokens": 200, "completion_tokens": 75},
+        "choices": [{"message": {"content": "## Root Cause\nFlaky test"}}],
+        "usage": {
+            "prompt_tokens": 1200,
+            "completion_tokens": 50,
+            "prompt_tokens_details": {"cached_tokens": 1024},
+        },
     }
-
-    respx_mock.post("https://api.anthropic.com/v1/chat/completions").mock(
+    respx_mock.post("https://api.openai.com/v1/chat/completions").mock(
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    client = LLMClient(
-        provider="anthropic",
-        api_key="test-key",
-        model="claude-3-5-haiku-latest",
-    )
+    client = LLMClient(provider="openai", api_key="test-key", model="gpt-4o-mini")
     result = await client.analyze(sample_job_log, "preprocessed logs")
 
-    assert isinstance(result, AnalysisResult)
-    assert "Root Cause" in result.analysis
-    assert result.input_tokens == 200
-    assert result.output_tokens == 75
+    assert result.input_tokens == 1200
+    assert result.cached_input_tokens == 1024
 
 
 @pytest.mark.asyncio
-async def test_analyze_with_openrouter(respx_mock, sample_job_log):
-    """Test analysis with OpenRouter provider."""
+async def test_analyze_reuses_client_within_context(respx_mock, sample_job_log):
+    """Test that analyze() calls inside "async with" share one HTTP client."""
     mock_response = {
-        "choices": [{"message": {"content": "Build failed due to missing dependency"}}],
-        "usage": {"prompt_tokens": 150, "completion_tokens": 60},
+        "choices": [{"message": {"content": "## Root Cause\nFlaky test"}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
     }
-
-    respx_mock.post("https://openrouter.ai/api/v1/chat/completions").mock(
+    route = respx_mock.post("https://api.openai.com/v1/chat/completions").mock(
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    client = LLMClient(
-        provider="openrouter",
-        api_key="test-key",
-        model="anthropic/claude-3.5-haiku",
-    )
-    result = await client.analyze(sample_job_log, "preprocessed logs")
+    client = LLMClient(provider="openai", api_key="test-key", model="gpt-4o-mini")
+    async with client:
+        shared = client._client
+        assert shared is not None
 
-    assert isinstance(result, AnalysisResult)
-    assert "Build failed" in result.analysis
+        await client.analyze(sample_job_log, "first job")
+        await client.analyze(sample_job_log, "second job")
+
+        assert client._client is shared
+
+    assert route.call_count == 2
+    assert shared.is_closed
+    assert client._client is None
 
 
 @pytest.mark.asyncio
-async def test_analyze_with_selfhosted(respx_mock, sample_job_log):
-    """Test analysis with selfhosted provider."""
+async def test_analyze_leaves_passed_client_open(respx_mock, sample_job_log):
+    """Test that a client passed to the constructor is used but not closed."""
     mock_response = {
-        "choices": [{"message": {"content": "Custom model analysis"}}],
-        "usage": {"prompt_tokens": 180, "completion_tokens": 70},
+        "choices": [{"message": {"content": "## Root Cause\nFlaky test"}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
     }
-
-    respx_mock.post("https://custom.llm.com/v1/chat/completions").mock(
+    respx_mock.post("https://api.openai.com/v1/chat/completions").mock(
         return_value=httpx.Response(200, json=mock_response)
     )
 
-    client = LLMClient(
-        provider="selfhosted",
-        api_key="test-key",
-        model="custom-model",
-        base_url="https://custom.llm.com/v1",
-    )
-    result = await client.analyze(sample_job_log, "preprocessed logs")
+    async with httpx.AsyncClient() as shared:
+        client = LLMClient(
+            provider="openai", api_key="test-key", model="gpt-4o-mini", client=shared
+        )
+        async with client:
+            assert client._client is shared
+            await client.analyze(sample_job_log, "first job")
 
-    assert isinstance(result, AnalysisResult)
-    assert "Custom model" in result.analysis
+        assert client._client is shared
+        assert not shared.is_closed
 
 
 def test_build_headers_openai():
@@ -158,3 +177,25 @@ def test_build_headers_openrouter():
     assert headers["Authorization"] == "Bearer test-key"
     assert headers["HTTP-Referer"] == "https://github.com/actions-ai-advisor"
     assert headers["X-Title"] == "Actions AI Advisor"
+
+
+@pytest.mark.asyncio
+async def test_analyze_sends_json_payload(respx_mock, sample_job_log):
+    """Test that the request body is the JSON chat payload."""
+    mock_response = {
+        "choices": [{"message": {"content": "## Root Cause\nFlaky test"}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+    }
+    route = respx_mock.post("https://api.openai.com/v1/chat/completions").mock(
+        return_value=httpx.Response(200, json=mock_response)
+    )
+
+    client = LLMClient(provider="openai", api_key="test-key", model="gpt-4o-mini")
+    await client.analyze(sample_job_log, "Error: Test failed")
+
+    request = route.calls.last.request
+    payload = json.loads(request.content)
+    assert request.headers["Content-Type"] == "application/json"
+    assert payload["model"] == "gpt-4o-mini"
+    assert [message["role"] for message in payload["messages"]] == ["system", "user"]
+    assert "Error: Test failed" in payload["messages"][1]["content"]
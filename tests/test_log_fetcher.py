@@ -1,9 +1,11 @@
 """Tests for log fetcher module."""
 
+import asyncio
+
 import httpx
 import pytest
 
-from actions_ai_advisor.log_fetcher import LogFetcher
+from actions_ai_advisor.log_fetcher import MAX_CONCURRENT_LOG_FETCHES, LogFetcher
 
 
 @pytest.mark.asyncio
@@ -116,3 +118,243 @@ async def test_no_failed_jobs(respx_mock):
     failed_jobs = await fetcher.fetch_failed_jobs()
 
     assert len(failed_jobs) == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_with_shared_client(respx_mock):
+    """Test that a passed-in client is used for every request and left open."""
+    jobs_response = {
+        "jobs": [
+            {"id": 123, "name": "build", "conclusion": "failure", "steps": []},
+        ]
+    }
+
+    jobs_route = respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    ).mock(return_value=httpx.Response(200, json=jobs_response))
+    logs_route = respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(return_value=httpx.Response(200, text="Error: boom"))
+
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        fetcher = LogFetcher(
+            github_token="test-token", repo="owner/repo", run_id="999", client=client
+        )
+        failed_jobs = await fetcher.fetch_failed_jobs()
+
+        assert not client.is_closed
+
+    assert [job.raw_logs for job in failed_jobs] == ["Error: boom"]
+    assert jobs_route.call_count == 1
+    assert logs_route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_across_pages(respx_mock):
+    """Test that every page announced by total_count is fetched, in page order."""
+    def page(ids):
+        return {
+            "total_count": 250,
+            "jobs": [
+                {"id": i, "name": f"job-{i}", "conclusion": "failure", "steps": []}
+                for i in ids
+            ],
+        }
+
+    jobs_url = "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    routes = [
+        respx_mock.get(jobs_url, params={"page": str(n), "per_page": "100"}).mock(
+            return_value=httpx.Response(200, json=page(ids))
+        )
+        for n, ids in ((1, range(100)), (2, range(100, 200)), (3, range(200, 250)))
+    ]
+    respx_mock.get(url__regex=r".*/actions/jobs/\d+/logs").mock(
+        return_value=httpx.Response(200, text="Error")
+    )
+
+    fetcher = LogFetcher(github_token="test-token", repo="owner/repo", run_id="999")
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    assert [job.job_name for job in failed_jobs] == [f"job-{i}" for i in range(250)]
+    assert [route.call_count for route in routes] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("content_range", "expected"),
+    [
+        ("bytes 1000-1029/1030", "Error: boom\nexit 1"),
+        ("bytes 0-29/30", "ial line\nError: boom\nexit 1"),
+    ],
+)
+async def test_fetch_failed_jobs_log_tail(respx_mock, content_range, expected):
+    """Test that only the log tail is requested and a cut first line is dropped."""
+    jobs_response = {
+        "jobs": [{"id": 123, "name": "build", "conclusion": "failure", "steps": []}]
+    }
+
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    ).mock(return_value=httpx.Response(200, json=jobs_response))
+    logs_route = respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(
+        return_value=httpx.Response(
+            206,
+            text="ial line\nError: boom\nexit 1",
+            headers={"Content-Range": content_range},
+        )
+    )
+
+    fetcher = LogFetcher(
+        github_token="test-token", repo="owner/repo", run_id="999", tail_bytes=30
+    )
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    assert logs_route.calls.last.request.headers["Range"] == "bytes=-30"
+    assert failed_jobs[0].raw_logs == expected
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_keeps_tail_when_range_ignored(respx_mock):
+    """Test that a whole log sent despite the Range header is cut to its tail."""
+    jobs_response = {
+        "jobs": [{"id": 123, "name": "build", "conclusion": "failure", "steps": []}]
+    }
+
+    async def whole_log():
+        for i in range(100):
+            yield f"line {i:02d} of the build\n".encode()
+
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    ).mock(return_value=httpx.Response(200, json=jobs_response))
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(return_value=httpx.Response(200, content=whole_log()))
+
+    fetcher = LogFetcher(
+        github_token="test-token", repo="owner/repo", run_id="999", tail_bytes=100
+    )
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    raw_logs = failed_jobs[0].raw_logs
+    assert raw_logs.startswith("line ")
+    assert raw_logs.endswith("line 99 of the build\n")
+    assert len(raw_logs) <= 100 + 2 * len("line 00 of the build\n")
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_tail_counts_bytes(respx_mock):
+    """Test that the tail budget is counted in bytes, not decoded characters."""
+    jobs_response = {
+        "jobs": [{"id": 123, "name": "build", "conclusion": "failure", "steps": []}]
+    }
+
+    async def whole_log():
+        for i in range(100):
+            yield f"échec {i:02d} ééé\n".encode()
+
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    ).mock(return_value=httpx.Response(200, json=jobs_response))
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(return_value=httpx.Response(200, content=whole_log()))
+
+    fetcher = LogFetcher(
+        github_token="test-token", repo="owner/repo", run_id="999", tail_bytes=100
+    )
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    raw_logs = failed_jobs[0].raw_logs
+    assert raw_logs.startswith("échec ")
+    assert raw_logs.endswith("échec 99 ééé\n")
+    assert len(raw_logs.encode()) <= 100
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_downloads_whole_log_by_default(respx_mock):
+    """Test that logs are downloaded in full unless a tail is requested."""
+    jobs_response = {
+        "jobs": [{"id": 123, "name": "build", "conclusion": "failure", "steps": []}]
+    }
+    whole_log = "Compiling app v0.1.0 (/home/runner/work/repo/repo/app)\n" + "x\n" * 100_000
+
+    respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/runs/999/jobs"
+    ).mock(return_value=httpx.Response(200, json=jobs_response))
+    logs_route = respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(return_value=httpx.Response(200, text=whole_log))
+
+    fetcher = LogFetcher(github_token="test-token", repo="owner/repo", run_id="999")
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    assert "Range" not in logs_route.calls.last.request.headers
+    assert failed_jobs[0].raw_logs == whole_log
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_reuses_client_within_context(respx_mock):
+    """Test that fetches inside "async with" share one HTTP client."""
+    jobs_response = {
+        "jobs": [
+            {"id": 123, "name": "build", "conclusion": "failure", "steps": []},
+        ]
+    }
+
+    respx_mock.get("https://api.github.com/repos/owner/repo/actions/runs/999/jobs").mock(
+        return_value=httpx.Response(200, json=jobs_response)
+    )
+    logs_route = respx_mock.get(
+        "https://api.github.com/repos/owner/repo/actions/jobs/123/logs"
+    ).mock(return_value=httpx.Response(200, text="Error: boom"))
+
+    fetcher = LogFetcher(github_token="test-token", repo="owner/repo", run_id="999")
+    async with fetcher:
+        shared = fetcher._client
+        assert shared is not None
+
+        await fetcher.fetch_failed_jobs()
+        await fetcher.fetch_failed_jobs()
+
+        assert fetcher._client is shared
+
+    assert logs_route.call_count == 2
+    assert shared.is_closed
+    assert fetcher._client is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_failed_jobs_bounds_concurrent_downloads(respx_mock):
+    """Test that log downloads overlap but never exceed the concurrency limit."""
+    jobs_response = {
+        "jobs": [
+            {"id": n, "name": f"job-{n}", "conclusion": "failure", "steps": []}
+            for n in range(20)
+        ]
+    }
+    in_flight = 0
+    peak = 0
+
+    async def slow_logs(request, job_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text=f"log {job_id}")
+
+    respx_mock.get("https://api.github.com/repos/owner/repo/actions/runs/999/jobs").mock(
+        return_value=httpx.Response(200, json=jobs_response)
+    )
+    respx_mock.get(url__regex=r".*/actions/jobs/(?P<job_id>\d+)/logs").mock(
+        side_effect=slow_logs
+    )
+
+    fetcher = LogFetcher(github_token="test-token", repo="owner/repo", run_id="999")
+    failed_jobs = await fetcher.fetch_failed_jobs()
+
+    assert [job.raw_logs for job in failed_jobs] == [f"log {n}" for n in range(20)]
+    assert peak == MAX_CONCURRENT_LOG_FETCHES
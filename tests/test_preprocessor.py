@@ -34,7 +34,7 @@ def test_remove_github_metadata():
         "more output",
         "::debug::Some debug info",
     ]
-    result = _remove_github_metadata(lines)
+    result = list(_remove_github_metadata(lines))
     assert result == ["actual test output", "more output"]
 
 
@@ -50,7 +50,7 @@ def test_collapse_repeated_lines():
         "line 3",
         "line 4",
     ]
-    result = _collapse_repeated_lines(lines)
+    result = list(_collapse_repeated_lines(lines))
     assert result == [
         "line 1",
         "line 2",
@@ -63,21 +63,21 @@ def test_collapse_repeated_lines():
 def test_collapse_repeated_lines_exactly_three():
     """Test collapsing exactly 3 repeated lines."""
     lines = ["warning", "warning", "warning"]
-    result = _collapse_repeated_lines(lines)
+    result = list(_collapse_repeated_lines(lines))
     assert result == ["warning (repeated 3 times)"]
 
 
 def test_collapse_repeated_lines_less_than_three():
     """Test not collapsing less than 3 repeated lines."""
     lines = ["line", "line", "other"]
-    result = _collapse_repeated_lines(lines)
+    result = list(_collapse_repeated_lines(lines))
     assert result == ["line", "line", "other"]
 
 
 def test_remove_excessive_empty_lines():
     """Test removal of excessive empty lines."""
     lines = ["line 1", "", "", "", "", "line 2", "", "line 3"]
-    result = _remove_excessive_empty_lines(lines)
+    result = list(_remove_excessive_empty_lines(lines))
     assert result == ["line 1", "", "", "line 2", "", "line 3"]
 
 
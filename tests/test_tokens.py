@@ -29,6 +29,18 @@ def test_token_counting_fallback_for_unknown_model():
     assert tokens > 0
 
 
+def test_counters_share_encoding():
+    """Test that counters for the same model reuse one loaded encoding."""
+    assert TokenCounter("gpt-4o-mini").encoding is TokenCounter("gpt-4o-mini").encoding
+
+
+def test_count_many_matches_count_tokens():
+    """Test that batch counting agrees with counting texts one by one."""
+    counter = TokenCounter("gpt-4o-mini")
+    texts = ["Hello, world!", "", "Error: Test failed\nat line 42"]
+    assert counter.count_many(texts) == [counter.count_tokens(text) for text in texts]
+
+
 def test_cost_estimation_openai():
     """Test cost estimation for OpenAI models."""
     cost = TokenCounter.estimate_cost(
@@ -39,6 +51,20 @@ def test_cost_estimation_openai():
     assert 0.0004 <= cost <= 0.0005
 
 
+def test_cost_estimation_discounts_cached_input():
+    """Test that cached input tokens are billed at the provider's cache price."""
+    cost = TokenCounter.estimate_cost(
+        input_tokens=1000,
+        output_tokens=500,
+        provider="openai",
+        model="gpt-4o-mini",
+        cached_input_tokens=800,
+    )
+    # (200 + 800 * 0.5) * 0.15 / 1M + 500 * 0.60 / 1M = 0.00009 + 0.0003 = 0.00039
+    assert cost is not None
+    assert abs(cost - 0.00039) < 1e-12
+
+
 def test_cost_estimation_anthropic():
     """Test cost estimation for Anthropic models."""
     cost = TokenCounter.estimate_cost(